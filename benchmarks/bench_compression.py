@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Benchmark CPU time against bytes sent for each compression level.
+
+Builds the SSE events the server sends for three kinds of payload: a large
+``count-chars`` result, a resource streamed in chunks and a rendered
+prompt. Each event stream is compressed the way the SSE transport does it,
+one flushed chunk per event, and the compressed size, the CPU time and the
+resulting time to deliver over a link of the given bandwidth are reported.
+
+Example usage:
+    python benchmarks/bench_compression.py --bandwidth-mbps 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import string
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from template_mcp.compression import StreamCompressor, available_encodings
+from template_mcp.config import ServerConfig
+from template_mcp.prompts import get_prompts
+from template_mcp.resources.example_resource import example_resource_reader
+from template_mcp.server import TemplateMCPServer
+
+LEVELS: Dict[str, List[int]] = {
+    "zstd": [1, 3, 9, 19],
+    "gzip": [1, 6, 9],
+    "deflate": [1, 6, 9],
+}
+
+
+def sse_event(request_id: int, result: Dict) -> bytes:
+    """Frame a JSON-RPC result as an SSE message event."""
+    message = {"jsonrpc": "2.0", "id": request_id, "result": result}
+    return f"event: message\r\ndata: {json.dumps(message)}\r\n\r\n".encode("utf-8")
+
+
+async def count_chars_events(text_bytes: int) -> List[bytes]:
+    """Call count-chars in-process on a large message."""
+    config = ServerConfig(profile_dir=tempfile.mkdtemp(prefix="bench_profiles_"))
+    server = TemplateMCPServer(config)
+    rng = random.Random(0)
+    vocabulary = [
+        "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(2, 9)))
+        for _ in range(5000)
+    ]
+    words: List[str] = []
+    length = 0
+    while length < text_bytes:
+        words.append(rng.choice(vocabulary))
+        length += len(words[-1]) + 1
+    message = " ".join(words)
+    async with server.connect() as session:
+        result = await session.call_tool("count-chars", {"message": message})
+    return [sse_event(1, result.model_dump(mode="json", exclude_none=True))]
+
+
+async def resource_events(chunks: int) -> List[bytes]:
+    """Stream the example resource as one event per chunk."""
+    events = []
+    for i in range(chunks):
+        async for _, content in example_resource_reader(f"chunk-{i}"):
+            result = {
+                "contents": [
+                    {
+                        "uri": "resource://example-resource",
+                        "mimeType": "text/plain",
+                        "text": f"[{i}] " + content.decode("utf-8"),
+                    }
+                ]
+            }
+            events.append(sse_event(i, result))
+    return events
+
+
+def prompt_events() -> List[bytes]:
+    """Render every example of every prompt."""
+    events = []
+    for prompt in get_prompts(ServerConfig()):
+        for example in prompt.get("examples", []):
+            text = prompt["template"].format(**example["template_variables"])
+            result = {
+                "description": prompt["description"],
+                "messages": [
+                    {"role": "user", "content": {"type": "text", "text": text}}
+                ],
+            }
+            events.append(sse_event(len(events), result))
+    return events
+
+
+def measure(
+    events: List[bytes], encoding: str, level: int, repeat: int
+) -> Tuple[int, float]:
+    """Compress an event stream chunk by chunk.
+
+    Returns:
+        Tuple of (compressed bytes, CPU milliseconds per stream)
+    """
+    size = 0
+    start = time.process_time()
+    for _ in range(repeat):
+        compressor = StreamCompressor(encoding, level)
+        size = sum(len(compressor.compress(event)) for event in events)
+        size += len(compressor.finish())
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+    return size, cpu_ms
+
+
+async def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--text-bytes", type=int, default=256 * 1024)
+    parser.add_argument("--chunks", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--bandwidth-mbps", type=float, default=50.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    payloads = {
+        "count-chars": await count_chars_events(args.text_bytes),
+        "resource": await resource_events(args.chunks),
+        "prompt": prompt_events(),
+    }
+    bytes_per_ms = args.bandwidth_mbps * 1_000_000 / 8 / 1000
+
+    print(
+        f"{'payload':<12} {'encoding':<9} {'level':>5} {'bytes':>10} "
+        f"{'ratio':>6} {'cpu ms':>8} {'wire ms':>8} {'total ms':>9}"
+    )
+    for name, events in payloads.items():
+        raw = sum(len(event) for event in events)
+        rows = [("identity", 0, raw, 0.0)]
+        for encoding in available_encodings():
+            for level in LEVELS[encoding]:
+                size, cpu_ms = measure(events, encoding, level, args.repeat)
+                rows.append((encoding, level, size, cpu_ms))
+
+        for encoding, level, size, cpu_ms in rows:
+            wire_ms = size / bytes_per_ms
+            print(
+                f"{name:<12} {encoding:<9} {level:>5} {size:>10} "
+                f"{raw / size:>6.2f} {cpu_ms:>8.3f} {wire_ms:>8.2f} "
+                f"{cpu_ms + wire_ms:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
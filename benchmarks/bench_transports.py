@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark the in-memory transport against stdio.
+
+Measures the time to connect and initialize a session, and the latency of
+sequential ``echo`` tool calls over each transport.
+
+Example usage:
+    python benchmarks/bench_transports.py --connects 5 --calls 200
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from template_mcp.config import ServerConfig
+from template_mcp.server import TemplateMCPServer
+
+RUN_SERVER = Path(__file__).resolve().parent.parent / "run_server.py"
+
+
+@asynccontextmanager
+async def stdio_session() -> AsyncIterator[ClientSession]:
+    """Spawn the server as a subprocess and connect over stdio."""
+    params = StdioServerParameters(command=sys.executable, args=[str(RUN_SERVER)])
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+def memory_session_factory() -> Callable[[], AsyncIterator[ClientSession]]:
+    """Build a factory connecting in-memory sessions to one server."""
+    config = ServerConfig(profile_dir=tempfile.mkdtemp(prefix="bench_profiles_"))
+    server = TemplateMCPServer(config)
+    return server.connect
+
+
+async def bench(
+    name: str,
+    connect: Callable[[], AsyncIterator[ClientSession]],
+    connects: int,
+    calls: int,
+) -> Dict[str, float]:
+    """Run the benchmark for one transport.
+
+    Args:
+        name: Transport name
+        connect: Factory returning a session context manager
+        connects: Number of connect/initialize cycles to time
+        calls: Number of sequential tool calls to time
+
+    Returns:
+        Dictionary of timings in milliseconds
+    """
+    connect_times: List[float] = []
+    for _ in range(connects):
+        start = time.perf_counter()
+        async with connect():
+            connect_times.append((time.perf_counter() - start) * 1000)
+
+    call_times: List[float] = []
+    async with connect() as session:
+        for i in range(calls):
+            start = time.perf_counter()
+            await session.call_tool("echo", {"message": f"message {i}"})
+            call_times.append((time.perf_counter() - start) * 1000)
+
+    call_times.sort()
+    return {
+        "transport": name,
+        "connect_ms": statistics.median(connect_times),
+        "call_p50_ms": call_times[len(call_times) // 2],
+        "call_p99_ms": call_times[
+            min(len(call_times) - 1, int(len(call_times) * 0.99))
+        ],
+        "calls_per_s": calls / (sum(call_times) / 1000),
+    }
+
+
+async def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connects", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    results = [
+        await bench("stdio", stdio_session, args.connects, args.calls),
+        await bench("memory", memory_session_factory(), args.connects, args.calls),
+    ]
+
+    print(
+        f"{'transport':<10} {'connect ms':>11} {'call p50 ms':>12} "
+        f"{'call p99 ms':>12} {'calls/s':>9}"
+    )
+    for row in results:
+        print(
+            f"{row['transport']:<10} {row['connect_ms']:>11.2f} "
+            f"{row['call_p50_ms']:>12.3f} {row['call_p99_ms']:>12.3f} "
+            f"{row['calls_per_s']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,9 +3,8 @@
 
 import logging
 import argparse
-from template_mcp.server import create_server, run_server
+from template_mcp.server import TemplateMCPServer
 from template_mcp.config import ServerConfig
-from template_mcp.tools import setup_tools
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +24,41 @@ def parse_args():
         "--transport", choices=["stdio", "sse"], default="stdio",
         help="Transport protocol to use (stdio or sse)"
     )
+    parser.add_argument(
+        "--profile-threshold-ms", type=float, default=None,
+        help="Capture a profile of calls slower than this many milliseconds"
+    )
+    parser.add_argument(
+        "--profile-sample-rate", type=float, default=0.0,
+        help="Fraction of calls to profile regardless of latency"
+    )
+    parser.add_argument(
+        "--profile-allocations", action="store_true",
+        help="Also capture tracemalloc snapshots for profiled calls"
+    )
+    parser.add_argument(
+        "--profile-control", action="store_true",
+        help="Register the configure-profiling tool to change profiling at runtime"
+    )
+    parser.add_argument(
+        "--compression-min-size", type=int, default=1024,
+        help="Smallest separate response body in bytes that is compressed; "
+        "the SSE event stream carrying tool and resource results is always "
+        "compressed"
+    )
+    parser.add_argument(
+        "--no-compression", action="store_true",
+        help="Disable response compression on the SSE transport"
+    )
+    parser.add_argument(
+        "--offload-thread-workers", type=int, default=4,
+        help="Threads running large calls to CPU-bound tools (0 runs inline the "
+        "calls not sent to processes)"
+    )
+    parser.add_argument(
+        "--offload-process-workers", type=int, default=0,
+        help="Processes running large calls to tools declared cpu_bound='process'"
+    )
     return parser.parse_args()
 
 
@@ -34,17 +68,25 @@ def main():
     args = parse_args()
     
     # Create configuration
-    config = ServerConfig(debug=args.debug)
-    
-    # Create server
-    server = create_server(config)
+    config = ServerConfig(
+        debug=args.debug,
+        profile_threshold_ms=args.profile_threshold_ms,
+        profile_sample_rate=args.profile_sample_rate,
+        profile_allocations=args.profile_allocations,
+        profile_control=args.profile_control,
+        compression_min_size=args.compression_min_size,
+        offload_thread_workers=args.offload_thread_workers,
+        offload_process_workers=args.offload_process_workers,
+    )
+    if args.no_compression:
+        config.compression_encodings = []
     
-    # Setup tools
-    setup_tools(server, config)
+    # Create server with its tools and resources
+    server = TemplateMCPServer(config)
     
     # Run the server
     logger.info(f"Starting Template MCP server with {args.transport} transport")
-    run_server(server, transport=args.transport)
+    server.run(transport=args.transport)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,654 @@
+"""Async client library for the Template MCP server."""
+
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+import anyio
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    CONNECTION_CLOSED,
+    CallToolResult,
+    ListPromptsResult,
+    ListResourcesResult,
+    ListToolsResult,
+    ReadResourceResult,
+)
+from pydantic import AnyUrl
+
+from .memory_transport import memory_client_transport
+
+logger = logging.getLogger(__name__)
+
+# Error codes reported by the MCP session when the transport fails
+_TRANSIENT_ERROR_CODES = {CONNECTION_CLOSED, httpx.codes.REQUEST_TIMEOUT}
+
+_TRANSIENT_EXCEPTIONS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    httpx.TransportError,
+    ConnectionError,
+    asyncio.TimeoutError,
+)
+
+T = TypeVar("T")
+
+TransportFactory = Callable[[], AsyncContextManager[Tuple[Any, Any]]]
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Check whether an error is a transport failure worth retrying.
+
+    Args:
+        error: The raised exception
+
+    Returns:
+        True if the call may succeed on a fresh session
+    """
+    if isinstance(error, McpError):
+        return error.error.code in _TRANSIENT_ERROR_CODES
+    return isinstance(error, _TRANSIENT_EXCEPTIONS)
+
+
+class ToolCallStats:
+    """Timing statistics for calls to one tool."""
+
+    __slots__ = ("calls", "errors", "retries", "total_ms", "max_ms", "recent_ms")
+
+    def __init__(self, window: int = 1024):
+        """Initialize empty statistics.
+
+        Args:
+            window: Number of recent call durations kept for percentiles
+        """
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent_ms: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, attempts: int, ok: bool) -> None:
+        """Record one call.
+
+        Args:
+            elapsed_ms: Total duration including retries
+            attempts: Number of attempts made
+            ok: Whether the call eventually succeeded
+        """
+        self.calls += 1
+        self.retries += attempts - 1
+        if not ok:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.recent_ms.append(elapsed_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the statistics.
+
+        Returns:
+            Dictionary with counts and latency figures in milliseconds
+        """
+        recent = sorted(self.recent_ms)
+
+        def percentile(fraction: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(len(recent) * fraction))]
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "mean_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": self.max_ms,
+        }
+
+
+class _PooledSession:
+    """A client session hosted in its own task.
+
+    The transport and session contexts must be entered and exited by the
+    same task, so each pooled session runs in a dedicated task that stays
+    open until the session is closed.
+    """
+
+    def __init__(self, transport: TransportFactory, max_in_flight: int):
+        self.transport = transport
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.broken = False
+        self.session: Optional[ClientSession] = None
+        self._closing = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def open(self) -> None:
+        connected = asyncio.Event()
+        self._task = asyncio.create_task(self._hold(connected))
+        waiter = asyncio.create_task(connected.wait())
+        try:
+            await asyncio.wait(
+                {self._task, waiter}, return_when=asyncio.FIRST_COMPLETED
+            )
+        except asyncio.CancelledError:
+            waiter.cancel()
+            self._task.cancel()
+            raise
+        if self._task.done():
+            waiter.cancel()
+            # Surface the connection error
+            self._task.result()
+            raise ConnectionError("Session closed during initialization")
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception as e:
+                logger.debug(f"Error while closing session: {e}")
+
+    async def _hold(self, connected: asyncio.Event) -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(self.transport())
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+                self.session = session
+                connected.set()
+                await self._closing.wait()
+        finally:
+            # A session whose transport went away can no longer serve calls
+            self.broken = True
+
+
+class PinnedSession:
+    """One pooled session reserved for calls that depend on session state.
+
+    Obtained from ``TemplateMCPClient.session()``. Every call goes to the
+    same server session and is timed like any other, but is never retried:
+    a retry would run on another session, where the state is missing, and
+    could repeat an operation that is not idempotent. A transport failure
+    marks the session broken and is raised to the caller.
+    """
+
+    def __init__(self, client: "TemplateMCPClient", pooled: _PooledSession):
+        """Initialize the pinned session.
+
+        Args:
+            client: The client owning the pool
+            pooled: The reserved pooled session
+        """
+        self._client = client
+        self._pooled = pooled
+
+    async def call_tool(
+        self, name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> CallToolResult:
+        """Call a tool on the pinned session.
+
+        Args:
+            name: Name of the tool
+            arguments: Tool arguments
+
+        Returns:
+            The tool result
+        """
+        return await self.run(name, lambda session: session.call_tool(name, arguments))
+
+    async def read_resource(self, uri: str) -> ReadResourceResult:
+        """Read a resource by URI on the pinned session.
+
+        Args:
+            uri: URI of the resource
+        """
+        return await self.run(
+            "resources/read", lambda session: session.read_resource(AnyUrl(uri))
+        )
+
+    async def run(
+        self, label: str, operation: Callable[[ClientSession], Awaitable[T]]
+    ) -> T:
+        """Run an operation on the pinned session, timing it.
+
+        Args:
+            label: Name under which the call is timed
+            operation: Coroutine function receiving the session
+
+        Returns:
+            The result of the operation
+        """
+        stats = self._client._stats_for(label)
+        start = time.perf_counter()
+        try:
+            if self._pooled.broken or self._pooled.session is None:
+                raise ConnectionError("Pinned session is closed")
+            result = await operation(self._pooled.session)
+        except Exception as e:
+            if is_transient_error(e):
+                self._pooled.broken = True
+            stats.record((time.perf_counter() - start) * 1000, 1, False)
+            raise
+        stats.record((time.perf_counter() - start) * 1000, 1, True)
+        return result
+
+
+class TemplateMCPClient:
+    """Pooled, pipelining client for the Template MCP server.
+
+    The client keeps ``pool_size`` warm sessions open over stdio or SSE and
+    sends each call on the least busy one. Many calls may share a session;
+    ``max_in_flight`` bounds how many are outstanding on each session at
+    once. Calls that fail because of the transport are retried on a fresh
+    session with jittered exponential backoff, and every call is timed.
+    Calls that rely on state kept by the server session, such as
+    ``count-chars-*`` handles, must go through ``session()`` instead.
+
+    Example:
+        async with TemplateMCPClient.from_script("run_server.py") as client:
+            results = await client.call_many(
+                ("count-chars", {"message": text}) for text in texts
+            )
+    """
+
+    def __init__(
+        self,
+        transport: TransportFactory,
+        pool_size: int = 2,
+        max_in_flight: int = 16,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+    ):
+        """Initialize the client.
+
+        Args:
+            transport: Factory returning a (read, write) stream context manager
+            pool_size: Number of sessions kept open
+            max_in_flight: Maximum concurrent calls per session
+            max_retries: Retries after a transient transport error
+            backoff_base: Base delay in seconds for the first retry
+            backoff_max: Upper bound in seconds for a retry delay
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.transport = transport
+        self.pool_size = pool_size
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._pool: List[_PooledSession] = []
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._closing: Set["asyncio.Task[None]"] = set()
+        self._refill_task: Optional["asyncio.Task[None]"] = None
+        self._stats: Dict[str, ToolCallStats] = {}
+
+    @classmethod
+    def stdio(
+        cls,
+        command: str,
+        args: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> "TemplateMCPClient":
+        """Create a client for a server spawned as a subprocess.
+
+        Args:
+            command: Executable to run
+            args: Command line arguments
+            env: Environment for the subprocess
+            **kwargs: Further arguments for the client
+
+        Returns:
+            A client using the stdio transport
+        """
+        params = StdioServerParameters(command=command, args=args or [], env=env)
+        return cls(lambda: stdio_client(params), **kwargs)
+
+    @classmethod
+    def from_script(cls, server_script_path: str, **kwargs: Any) -> "TemplateMCPClient":
+        """Create a stdio client for a Python or Node.js server script.
+
+        Args:
+            server_script_path: Path to a .py or .js server script
+            **kwargs: Further arguments for the client
+
+        Returns:
+            A client using the stdio transport
+        """
+        if server_script_path.endswith(".py"):
+            command = sys.executable
+        elif server_script_path.endswith(".js"):
+            command = "node"
+        else:
+            raise ValueError("Server script must be a .py or .js file")
+        return cls.stdio(command, [server_script_path], **kwargs)
+
+    @classmethod
+    def sse(
+        cls,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> "TemplateMCPClient":
+        """Create a client for a server reachable over SSE.
+
+        Args:
+            url: URL of the server's SSE endpoint
+            headers: Extra HTTP headers
+            **kwargs: Further arguments for the client
+
+        Returns:
+            A client using the SSE transport
+        """
+        return cls(lambda: sse_client(url, headers=headers), **kwargs)
+
+    @classmethod
+    def in_memory(cls, server, **kwargs: Any) -> "TemplateMCPClient":
+        """Create a client for a FastMCP server running in this process.
+
+        Args:
+            server: The FastMCP server instance
+            **kwargs: Further arguments for the client
+
+        Returns:
+            A client using the in-memory transport
+        """
+        return cls(lambda: memory_client_transport(server), **kwargs)
+
+    async def __aenter__(self) -> "TemplateMCPClient":
+        """Open the session pool."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the session pool."""
+        await self.close()
+
+    async def start(self) -> None:
+        """Open all sessions in the pool concurrently."""
+        async with self._lock():
+            missing = self.pool_size - len(self._pool)
+            sessions = [
+                _PooledSession(self.transport, self.max_in_flight)
+                for _ in range(missing)
+            ]
+            results = await asyncio.gather(
+                *(session.open() for session in sessions), return_exceptions=True
+            )
+            for session, result in zip(sessions, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to open session: {result}")
+                else:
+                    self._pool.append(session)
+            if not self._pool:
+                raise ConnectionError("Could not open any session")
+        logger.info(f"Opened {len(self._pool)} sessions")
+
+    async def close(self) -> None:
+        """Close all sessions in the pool."""
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            await asyncio.gather(self._refill_task, return_exceptions=True)
+            self._refill_task = None
+        async with self._lock():
+            pool, self._pool = self._pool, []
+        await asyncio.gather(*(session.close() for session in pool))
+        if self._closing:
+            await asyncio.gather(*self._closing)
+
+    async def call_tool(
+        self, name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> CallToolResult:
+        """Call a tool, retrying transient transport errors.
+
+        Args:
+            name: Name of the tool
+            arguments: Tool arguments
+
+        Returns:
+            The tool result
+        """
+        return await self.run(name, lambda session: session.call_tool(name, arguments))
+
+    async def list_tools(self) -> ListToolsResult:
+        """List the tools provided by the server."""
+        return await self.run("tools/list", lambda session: session.list_tools())
+
+    async def list_resources(self) -> ListResourcesResult:
+        """List the resources provided by the server."""
+        return await self.run(
+            "resources/list", lambda session: session.list_resources()
+        )
+
+    async def list_prompts(self) -> ListPromptsResult:
+        """List the prompts provided by the server."""
+        return await self.run("prompts/list", lambda session: session.list_prompts())
+
+    async def read_resource(self, uri: str) -> ReadResourceResult:
+        """Read a resource by URI.
+
+        Args:
+            uri: URI of the resource
+        """
+        return await self.run(
+            "resources/read", lambda session: session.read_resource(AnyUrl(uri))
+        )
+
+    async def run(
+        self, label: str, operation: Callable[[ClientSession], Awaitable[T]]
+    ) -> T:
+        """Run an operation on a pooled session with retries and timing.
+
+        Args:
+            label: Name under which the call is timed
+            operation: Coroutine function receiving the session
+
+        Returns:
+            The result of the operation
+        """
+        stats = self._stats_for(label)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            pooled = None
+            try:
+                pooled = await self._acquire()
+                assert pooled.session is not None
+                result = await operation(pooled.session)
+            except Exception as e:
+                if not is_transient_error(e) or attempt > self.max_retries:
+                    stats.record((time.perf_counter() - start) * 1000, attempt, False)
+                    raise
+                if pooled is not None:
+                    pooled.broken = True
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"Transient error in {label} ({e!r}); "
+                    f"retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                if pooled is not None:
+                    self._release(pooled)
+
+            stats.record((time.perf_counter() - start) * 1000, attempt, True)
+            return result
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[PinnedSession]:
+        """Reserve one pooled session for calls that share server state.
+
+        The session keeps one of its call slots for as long as the context
+        is open, and calls made through it are not retried.
+
+        Example:
+            async with client.session() as session:
+                opened = await session.call_tool("count-chars-open", {})
+                ...
+
+        Yields:
+            The pinned session
+        """
+        pooled = await self._acquire()
+        try:
+            yield PinnedSession(self, pooled)
+        finally:
+            self._release(pooled)
+
+    async def call_many(
+        self,
+        calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Send many tool calls concurrently across the pool.
+
+        Concurrency is bounded by ``pool_size * max_in_flight``.
+
+        Args:
+            calls: Iterable of (tool name, arguments) pairs
+            return_exceptions: Return exceptions in the results instead of
+                raising the first one
+
+        Returns:
+            Results in the same order as ``calls``
+        """
+        return await asyncio.gather(
+            *(self.call_tool(name, arguments) for name, arguments in calls),
+            return_exceptions=return_exceptions,
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get call timing statistics.
+
+        Tool calls are keyed by tool name, other requests by MCP method.
+
+        Returns:
+            Dictionary mapping call labels to their statistics
+        """
+        return {name: stats.summary() for name, stats in self._stats.items()}
+
+    def _stats_for(self, label: str) -> ToolCallStats:
+        """Get the statistics for a call label, created on first use."""
+        stats = self._stats.get(label)
+        if stats is None:
+            stats = self._stats[label] = ToolCallStats()
+        return stats
+
+    async def _acquire(self) -> _PooledSession:
+        """Reserve a call slot on the least busy healthy session."""
+        self._discard_broken()
+        if not self._pool:
+            await self._reconnect()
+        if len(self._pool) < self.pool_size:
+            self._start_refill()
+        pooled = min(self._pool, key=lambda session: session.in_flight)
+        pooled.in_flight += 1
+        try:
+            await pooled.slots.acquire()
+        except BaseException:
+            pooled.in_flight -= 1
+            raise
+        return pooled
+
+    def _release(self, pooled: _PooledSession) -> None:
+        pooled.slots.release()
+        pooled.in_flight -= 1
+
+    def _discard_broken(self) -> None:
+        """Remove broken sessions from the pool and close them."""
+        broken = [session for session in self._pool if session.broken]
+        if not broken:
+            return
+        self._pool = [session for session in self._pool if not session.broken]
+        for session in broken:
+            # Close in the background; calls in flight there may still finish
+            task = asyncio.ensure_future(session.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _reconnect(self) -> None:
+        """Open a session for callers that found no healthy one."""
+        async with self._lock():
+            self._discard_broken()
+            if self._pool:
+                return
+            session = _PooledSession(self.transport, self.max_in_flight)
+            try:
+                await session.open()
+            except Exception as e:
+                raise ConnectionError(f"No session available: {e}") from e
+            self._pool.append(session)
+
+    def _start_refill(self) -> None:
+        """Refill the pool in the background unless a refill is running."""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.ensure_future(self._refill())
+
+    async def _refill(self) -> None:
+        """Open sessions until the pool is full, backing off on failures.
+
+        Calls keep using the healthy sessions meanwhile, so a transport that
+        refuses new connections does not hold them up.
+        """
+        attempt = 0
+        while len(self._pool) < self.pool_size:
+            replacement = _PooledSession(self.transport, self.max_in_flight)
+            try:
+                await replacement.open()
+            except Exception as e:
+                attempt += 1
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"Could not refill session pool ({e!r}); retry in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            attempt = 0
+            if len(self._pool) < self.pool_size:
+                self._pool.append(replacement)
+            else:
+                await replacement.close()
+
+    def _lock(self) -> asyncio.Lock:
+        """Get the pool lock, created on the running event loop."""
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        return self._pool_lock
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
@@ -0,0 +1,266 @@
+"""Negotiated, streaming response compression for the HTTP transports."""
+
+import logging
+import zlib
+from types import ModuleType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+zstandard: Optional[ModuleType]
+try:
+    import zstandard
+except ImportError:  # zstd is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+Send = Callable[[Message], Awaitable[None]]
+Receive = Callable[[], Awaitable[Message]]
+ASGIApp = Callable[[Dict[str, Any], Receive, Send], Awaitable[None]]
+
+DEFAULT_LEVELS: Dict[str, int] = {"zstd": 3, "gzip": 6, "deflate": 6}
+
+
+def available_encodings() -> List[str]:
+    """List the supported content encodings, most preferred first.
+
+    Returns:
+        Encoding names; ``zstd`` is included when ``zstandard`` is installed
+    """
+    encodings = ["gzip", "deflate"]
+    if zstandard is not None:
+        encodings.insert(0, "zstd")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """Pick the content encoding for a client.
+
+    The encoding with the highest quality value in the ``Accept-Encoding``
+    header wins. Ties go to the earliest entry of ``encodings``.
+
+    Args:
+        accept_encoding: Value of the request's ``Accept-Encoding`` header
+        encodings: Encodings the server offers, most preferred first
+
+    Returns:
+        The chosen encoding, or None to send the response uncompressed
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    best: Optional[Tuple[float, int]] = None
+    chosen = None
+    for rank, encoding in enumerate(encodings):
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality <= 0:
+            continue
+        if best is None or (quality, -rank) > best:
+            best = (quality, -rank)
+            chosen = encoding
+    return chosen
+
+
+class StreamCompressor:
+    """Incremental compressor for one response body.
+
+    ``compress`` returns everything needed to decode the data passed so far,
+    so each chunk can be delivered to the client as soon as it is produced.
+    Later chunks still benefit from the history of earlier ones.
+    """
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        """Initialize the compressor.
+
+        Args:
+            encoding: One of ``zstd``, ``gzip`` or ``deflate``
+            level: Compression level, the encoding's default when omitted
+        """
+        if level is None:
+            level = DEFAULT_LEVELS[encoding]
+        self.encoding = encoding
+        # zstandard and zlib compression objects share compress() and flush()
+        self._compressor: Any
+        if encoding == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd compression requires the zstandard package")
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        elif encoding == "gzip":
+            self._compressor = zlib.compressobj(
+                level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+        elif encoding == "deflate":
+            self._compressor = zlib.compressobj(level)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it.
+
+        Args:
+            data: The chunk
+
+        Returns:
+            Compressed bytes decodable without any later output
+        """
+        return self._compressor.compress(data) + self._compressor.flush(
+            self._flush_mode
+        )
+
+    def finish(self) -> bytes:
+        """End the compressed stream.
+
+        Returns:
+            The trailing bytes of the stream
+        """
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with a negotiated encoding.
+
+    A response whose complete size is known is compressed only if it holds
+    at least ``minimum_size`` bytes. Streamed responses of unknown length,
+    such as the SSE event stream, are always compressed chunk by chunk and
+    each chunk is flushed, so events reach the client as soon as they are
+    sent. On the SSE transport every JSON-RPC result travels over that
+    stream, so ``minimum_size`` never applies to results.
+    Responses that already carry a ``Content-Encoding`` are left alone.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Optional[Sequence[str]] = None,
+        levels: Optional[Dict[str, int]] = None,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            minimum_size: Smallest known-size body worth compressing
+            encodings: Encodings to offer, most preferred first; defaults to
+                every available encoding
+            levels: Compression level per encoding
+        """
+        supported = available_encodings()
+        if encodings is None:
+            encodings = supported
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [encoding for encoding in encodings if encoding in supported]
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send):
+        """Handle an ASGI connection."""
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(
+            send, encoding, self.levels.get(encoding), self.minimum_size
+        )
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """Send callable that compresses one response body."""
+
+    def __init__(
+        self, send: Send, encoding: str, level: Optional[int], minimum_size: int
+    ):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk decides the encoding
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = list(start.get("headers", []))
+            if not self._should_compress(headers, body, more_body):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.compressor = StreamCompressor(self.encoding, self.level)
+            headers = [
+                (key, value)
+                for key, value in headers
+                if key.lower() != b"content-length"
+            ]
+            headers.append((b"content-encoding", self.encoding.encode("ascii")))
+            headers.append((b"vary", b"Accept-Encoding"))
+            if not more_body:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers.append((b"content-length", str(len(body)).encode("ascii")))
+                await self.send({**start, "headers": headers})
+                await self.send({**message, "body": body})
+                return
+            await self.send({**start, "headers": headers})
+
+        assert self.compressor is not None
+        if more_body:
+            body = self.compressor.compress(body) if body else b""
+        else:
+            body = self.compressor.compress(body) + self.compressor.finish()
+        await self.send({**message, "body": body})
+
+    def _should_compress(
+        self, headers: List[Tuple[bytes, bytes]], body: bytes, more_body: bool
+    ) -> bool:
+        content_length = None
+        for key, value in headers:
+            name = key.lower()
+            if name == b"content-encoding":
+                return False
+            if name == b"content-length":
+                content_length = int(value)
+
+        if not more_body:
+            return len(body) >= self.minimum_size
+        if content_length is not None:
+            return content_length >= self.minimum_size
+        return True
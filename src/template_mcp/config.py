@@ -1,7 +1,8 @@
 """Configuration module for MCP server."""
 
 import os
-from typing import Optional, Dict, Any
+import tempfile
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
 
@@ -54,7 +55,150 @@ class ServerConfig(BaseModel):
         default_factory=dict,
         description="Configuration for prompts"
     )
-    
+
+    # Configuration for slow-call profiling
+    profile_threshold_ms: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="Capture a profile of tool and resource calls slower than this"
+    )
+
+    profile_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of calls to profile regardless of latency"
+    )
+
+    profile_allocations: bool = Field(
+        default=False,
+        description="Also capture a tracemalloc snapshot for profiled calls"
+    )
+
+    profile_control: bool = Field(
+        default=False,
+        description="Register a tool that changes the profiler threshold and sample rate at runtime"
+    )
+
+    profile_dir: str = Field(
+        default_factory=lambda: os.getenv(
+            "PROFILE_DIR",
+            os.path.join(tempfile.gettempdir(), "template_mcp_profiles"),
+        ),
+        description="Directory holding the ring of captured profiles"
+    )
+
+    profile_max_files: int = Field(
+        default=20,
+        ge=1,
+        description="Maximum number of captured profiles kept on disk"
+    )
+
+    # Configuration for per-session state
+    max_sessions: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of client sessions with state kept in memory"
+    )
+
+    session_idle_timeout: float = Field(
+        default=900.0,
+        gt=0,
+        description="Seconds of inactivity after which session state is evicted"
+    )
+
+    session_memory_budget: int = Field(
+        default=64 * 1024,
+        ge=0,
+        description="Maximum bytes of cached data held for each session"
+    )
+
+    # Configuration for incremental analysis
+    count_handle_ttl: float = Field(
+        default=600.0,
+        gt=0,
+        description="Seconds an unused incremental count-chars handle stays open"
+    )
+
+    # Configuration for tool call coalescing
+    coalesce_tool_calls: bool = Field(
+        default=True,
+        description="Share one execution between identical concurrent calls "
+        "to tools registered with coalesce=True"
+    )
+
+    # Configuration for offloading CPU-bound tools
+    offload_thread_workers: int = Field(
+        default=4,
+        ge=0,
+        description="Threads running large calls to CPU-bound tools; 0 runs "
+        "on the event loop every call not sent to a process worker"
+    )
+
+    offload_process_workers: int = Field(
+        default=0,
+        ge=0,
+        description="Processes running large calls to tools declared "
+        "cpu_bound='process'; 0 sends them to the thread workers"
+    )
+
+    loop_lag_interval_ms: float = Field(
+        default=100.0,
+        gt=0,
+        description="Milliseconds between event-loop lag measurements"
+    )
+
+    loop_lag_threshold_ms: float = Field(
+        default=50.0,
+        ge=0,
+        description="Event-loop lag in milliseconds logged as a stall"
+    )
+
+    # Configuration for resource subscriptions
+    resource_debounce_ms: float = Field(
+        default=50.0,
+        ge=0,
+        description="Milliseconds to coalesce resource changes before notifying subscribers"
+    )
+
+    resource_delta_buffer_bytes: int = Field(
+        default=1024 * 1024,
+        ge=0,
+        description="Maximum appended bytes kept per resource for delta reads"
+    )
+
+    resource_notify_timeout: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds to wait for each resource update notification to be sent"
+    )
+
+    tool_call_log_bytes: int = Field(
+        default=256 * 1024,
+        ge=0,
+        description="Maximum size in bytes of the tool-call-log resource"
+    )
+
+    # Configuration for response compression on the SSE transport
+    compression_encodings: List[str] = Field(
+        default_factory=lambda: ["zstd", "gzip", "deflate"],
+        description="Content encodings offered to clients, most preferred first; "
+        "zstd is skipped when zstandard is not installed and an empty list "
+        "disables compression"
+    )
+
+    compression_min_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Smallest known-size response body in bytes that is "
+        "compressed; does not apply to the SSE event stream"
+    )
+
+    compression_levels: Dict[str, int] = Field(
+        default_factory=lambda: {"zstd": 3, "gzip": 6, "deflate": 6},
+        description="Compression level for each content encoding"
+    )
+
     def get_api_key(self, service: str) -> Optional[str]:
         """Get API key for a specific service.
         
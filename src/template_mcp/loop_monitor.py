@@ -0,0 +1,113 @@
+"""Event-loop lag monitoring."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from .config import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop runs a periodic timer.
+
+    Every ``interval`` seconds the monitor schedules a wake-up and records
+    how much later than requested it ran. Any lag is time during which a
+    callback blocked the loop, delaying every session's requests and
+    notifications. Lags of at least ``threshold_ms`` are logged as stalls.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold_ms: float = 50.0):
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between measurements
+            threshold_ms: Lag in milliseconds reported as a stall
+        """
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.samples = 0
+        self.stalls = 0
+        self.max_lag_ms = 0.0
+        self.total_lag_ms = 0.0
+        self.last_stall_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._users = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "EventLoopLagMonitor":
+        """Create a monitor from the server configuration.
+
+        Args:
+            config: Server configuration
+
+        Returns:
+            A configured monitor
+        """
+        return cls(
+            interval=config.loop_lag_interval_ms / 1000,
+            threshold_ms=config.loop_lag_threshold_ms,
+        )
+
+    @asynccontextmanager
+    async def running(self) -> AsyncIterator["EventLoopLagMonitor"]:
+        """Monitor the running event loop while the context is open.
+
+        Nested uses share one monitoring task, which stops when the last
+        context exits.
+
+        Yields:
+            The monitor
+        """
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        self._users += 1
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0 and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    def record(self, lag_ms: float) -> None:
+        """Record one lag measurement.
+
+        Args:
+            lag_ms: How late the timer ran, in milliseconds
+        """
+        self.samples += 1
+        self.total_lag_ms += lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if lag_ms >= self.threshold_ms:
+            self.stalls += 1
+            self.last_stall_ms = lag_ms
+            logger.warning(f"Event loop blocked for {lag_ms:.1f} ms")
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize the measured lag.
+
+        Returns:
+            Dictionary with sample count, mean and max lag and stall counts
+        """
+        return {
+            "running": self._task is not None,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold_ms,
+            "samples": self.samples,
+            "mean_lag_ms": (
+                round(self.total_lag_ms / self.samples, 3) if self.samples else 0.0
+            ),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "stalls": self.stalls,
+            "last_stall_ms": self.last_stall_ms,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, (time.perf_counter() - expected) * 1000))
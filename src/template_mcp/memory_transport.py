@@ -0,0 +1,128 @@
+"""In-process transport connecting a client session directly to a server."""
+
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Tuple, Union
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from fastmcp import FastMCP
+from mcp import ClientSession
+from mcp.shared.message import SessionMessage
+
+logger = logging.getLogger(__name__)
+
+Message = Union[SessionMessage, Exception]
+MessageStreams = Tuple[
+    MemoryObjectReceiveStream[Message], MemoryObjectSendStream[Message]
+]
+
+
+@asynccontextmanager
+async def create_memory_streams(
+    buffer_size: int = 32,
+) -> AsyncIterator[Tuple[MessageStreams, MessageStreams]]:
+    """Create paired in-memory streams for a client and a server.
+
+    Messages are passed as objects, so no bytes are encoded or framed.
+    ``buffer_size`` messages can be queued in each direction before a sender
+    waits, which lets pipelined requests flow without a round trip each.
+
+    Args:
+        buffer_size: Number of messages buffered in each direction
+
+    Yields:
+        A tuple of (client_streams, server_streams), each (read, write)
+    """
+    server_to_client_send, server_to_client_receive = anyio.create_memory_object_stream[
+        Message
+    ](buffer_size)
+    client_to_server_send, client_to_server_receive = anyio.create_memory_object_stream[
+        Message
+    ](buffer_size)
+
+    async with AsyncExitStack() as stack:
+        for stream in (
+            server_to_client_send,
+            server_to_client_receive,
+            client_to_server_send,
+            client_to_server_receive,
+        ):
+            await stack.enter_async_context(stream)
+        yield (
+            (server_to_client_receive, client_to_server_send),
+            (client_to_server_receive, server_to_client_send),
+        )
+
+
+@asynccontextmanager
+async def memory_client_transport(
+    server: FastMCP,
+    buffer_size: int = 32,
+    raise_exceptions: bool = False,
+) -> AsyncIterator[MessageStreams]:
+    """Run a server in this process and yield the client's streams.
+
+    The server runs as a task on the current event loop for as long as the
+    context is open. The streams can be handed to a ``ClientSession`` just
+    like the ones produced by the stdio and SSE clients.
+
+    Args:
+        server: The FastMCP server instance
+        buffer_size: Number of messages buffered in each direction
+        raise_exceptions: Propagate handler exceptions instead of returning
+            them to the client as errors
+
+    Yields:
+        A (read, write) stream pair for the client
+    """
+    lowlevel = server._mcp_server
+
+    async with create_memory_streams(buffer_size) as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(
+                partial(
+                    lowlevel.run,
+                    server_streams[0],
+                    server_streams[1],
+                    lowlevel.create_initialization_options(),
+                    raise_exceptions=raise_exceptions,
+                )
+            )
+            try:
+                yield client_streams
+            finally:
+                tg.cancel_scope.cancel()
+
+
+@asynccontextmanager
+async def connect_in_memory(
+    server: FastMCP,
+    buffer_size: int = 32,
+    raise_exceptions: bool = False,
+    **session_kwargs: Any,
+) -> AsyncIterator[ClientSession]:
+    """Connect an initialized client session to a server in this process.
+
+    No subprocess is spawned and messages are not serialized, which makes
+    this transport suited to embedding the server in another service and to
+    tests.
+
+    Args:
+        server: The FastMCP server instance
+        buffer_size: Number of messages buffered in each direction
+        raise_exceptions: Propagate handler exceptions instead of returning
+            them to the client as errors
+        **session_kwargs: Extra keyword arguments for ``ClientSession``
+
+    Yields:
+        An initialized client session
+    """
+    async with memory_client_transport(
+        server, buffer_size, raise_exceptions
+    ) as streams:
+        async with ClientSession(streams[0], streams[1], **session_kwargs) as session:
+            await session.initialize()
+            logger.debug("Connected in-memory client session")
+            yield session
@@ -0,0 +1,420 @@
+"""Slow-call profiling for tool and resource execution."""
+
+import cProfile
+import contextvars
+import functools
+import logging
+import marshal
+import os
+import random
+import re
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .config import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = ".prof"
+ALLOCATIONS_SUFFIX = ".tracemalloc"
+
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+ResourceChunk = Tuple[Dict[str, Any], bytes]
+
+
+class _Capture:
+    """State of one in-progress profiled call."""
+
+    __slots__ = (
+        "profile",
+        "owns_tracemalloc",
+        "sampled",
+        "started",
+        "offloaded",
+        "offloaded_stats",
+    )
+
+    def __init__(
+        self, profile: cProfile.Profile, owns_tracemalloc: bool, sampled: bool
+    ):
+        self.profile = profile
+        self.owns_tracemalloc = owns_tracemalloc
+        self.sampled = sampled
+        self.started = time.perf_counter()
+        self.offloaded = False
+        self.offloaded_stats: Optional[Dict[Any, Any]] = None
+
+
+class SlowCallProfiler:
+    """Capture cProfile (and optionally tracemalloc) data for slow calls.
+
+    While a latency threshold or a sample rate is configured, calls are run
+    under ``cProfile`` and the profile is kept only if the call was sampled
+    or exceeded the threshold. Kept profiles are written to a bounded ring of
+    files in ``directory``; the oldest files are deleted once ``max_files``
+    captures exist.
+
+    Only one call is profiled at a time, and the profile also contains any
+    other coroutines that ran on the event loop while the call was
+    suspended. Before Python 3.12 ``cProfile`` only sees the thread that
+    enabled it. From 3.12 it is built on ``sys.monitoring``, which is shared
+    by the whole interpreter: a profile also records calls made by other
+    threads meanwhile, and no second profile can be enabled in the process
+    until it ends. Tool bodies that an executor runs off the
+    event loop are profiled in the worker instead (see ``offload_capture``),
+    and their captures are marked ``offloaded``. When neither a threshold
+    nor sampling is configured the wrappers only check a single flag.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        threshold_ms: Optional[float] = None,
+        sample_rate: float = 0.0,
+        capture_allocations: bool = False,
+        max_files: int = 20,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            directory: Directory that holds the profile ring
+            threshold_ms: Keep profiles of calls slower than this, if set
+            sample_rate: Fraction of calls to profile regardless of latency
+            capture_allocations: Also capture a tracemalloc snapshot
+            max_files: Maximum number of captures kept on disk
+        """
+        if max_files < 1:
+            raise ValueError("max_files must be at least 1")
+        self.directory = directory
+        self.capture_allocations = capture_allocations
+        self.max_files = max_files
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.enabled = False
+        self._active = False
+        self._sequence = 0
+        self._captures: Deque[Dict[str, Any]] = deque()
+        self._current: contextvars.ContextVar[Optional[_Capture]] = (
+            contextvars.ContextVar("profiled_call", default=None)
+        )
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._update_enabled()
+        self._load_existing()
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "SlowCallProfiler":
+        """Create a profiler from the server configuration.
+
+        Args:
+            config: Server configuration
+
+        Returns:
+            A configured profiler
+        """
+        return cls(
+            directory=config.profile_dir,
+            threshold_ms=config.profile_threshold_ms,
+            sample_rate=config.profile_sample_rate,
+            capture_allocations=config.profile_allocations,
+            max_files=config.profile_max_files,
+        )
+
+    def set_threshold(self, threshold_ms: Optional[float]) -> None:
+        """Set or clear the latency threshold.
+
+        Args:
+            threshold_ms: Threshold in milliseconds, or None to disable
+        """
+        if threshold_ms is not None and threshold_ms < 0:
+            raise ValueError("threshold_ms must not be negative")
+        self.threshold_ms = threshold_ms
+        self._update_enabled()
+
+    def set_sample_rate(self, sample_rate: float) -> None:
+        """Set the fraction of calls profiled regardless of latency.
+
+        Args:
+            sample_rate: Value between 0.0 (off) and 1.0 (every call)
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0.0 and 1.0")
+        self.sample_rate = sample_rate
+        self._update_enabled()
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Call ``callback`` with the description of every new capture.
+
+        Args:
+            callback: Function receiving the capture description
+        """
+        self._listeners.append(callback)
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """List the captures currently in the ring, oldest first.
+
+        Returns:
+            List of capture descriptions
+        """
+        return [dict(entry) for entry in self._captures]
+
+    def wrap_tool(
+        self, name: str, func: Callable[..., Any], options: Dict[str, Any]
+    ) -> Callable[..., Any]:
+        """Wrap a tool function so slow calls are profiled.
+
+        Args:
+            name: Name of the tool
+            func: The async tool function
+            options: Tool registration options (unused)
+
+        Returns:
+            The wrapped tool function
+        """
+
+        @functools.wraps(func)
+        async def profiled_tool(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return await func(*args, **kwargs)
+            capture = self._start()
+            token = self._current.set(capture)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._current.reset(token)
+                self._finish(capture, "tool", name)
+
+        return profiled_tool
+
+    def offload_capture(self) -> bool:
+        """Hand the capture of the current tool call over to an executor.
+
+        Stops profiling the event loop for the call, since its body is about
+        to run in another thread or process. The executor should profile the
+        body itself and pass the statistics to ``attach_offloaded_stats``.
+
+        Returns:
+            True if the current call is being profiled
+        """
+        capture = self._current.get()
+        if capture is None or capture.offloaded:
+            return False
+        capture.profile.disable()
+        capture.offloaded = True
+        return True
+
+    def attach_offloaded_stats(self, stats: Dict[Any, Any]) -> None:
+        """Record the profile of an offloaded tool body.
+
+        Args:
+            stats: ``cProfile`` statistics collected by the executor
+        """
+        capture = self._current.get()
+        if capture is not None and capture.offloaded:
+            capture.offloaded_stats = stats
+
+    def wrap_reader(
+        self, name: str, reader: Callable[..., AsyncIterator[ResourceChunk]]
+    ) -> Callable[..., AsyncIterator[ResourceChunk]]:
+        """Wrap a resource reader so slow reads are profiled.
+
+        Args:
+            name: Name of the resource
+            reader: The async generator function reading the resource
+
+        Returns:
+            A reader with the same signature
+        """
+
+        @functools.wraps(reader)
+        def profiled_reader(*args: Any, **kwargs: Any) -> AsyncIterator[ResourceChunk]:
+            if not self.enabled:
+                return reader(*args, **kwargs)
+            return self._profile_stream(name, reader(*args, **kwargs))
+
+        return profiled_reader
+
+    async def _profile_stream(
+        self, name: str, chunks: AsyncIterator[ResourceChunk]
+    ) -> AsyncGenerator[ResourceChunk, None]:
+        capture = self._start()
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            self._finish(capture, "resource", name)
+
+    def _update_enabled(self) -> None:
+        self.enabled = self.threshold_ms is not None or self.sample_rate > 0.0
+
+    def _start(self) -> Optional[_Capture]:
+        """Start profiling the current call if no other call is profiled."""
+        if self._active:
+            return None
+
+        sampled = self.sample_rate > 0.0 and random.random() < self.sample_rate
+        if self.threshold_ms is None and not sampled:
+            return None
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. an outer cProfile run) is active
+            logger.debug("Skipping capture: another profiler is active")
+            return None
+
+        owns_tracemalloc = False
+        if self.capture_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            owns_tracemalloc = True
+
+        self._active = True
+        return _Capture(profile, owns_tracemalloc, sampled)
+
+    def _finish(self, capture: Optional[_Capture], kind: str, name: str) -> None:
+        """Stop profiling and keep the capture if it qualifies."""
+        if capture is None:
+            return
+
+        capture.profile.disable()
+        elapsed_ms = (time.perf_counter() - capture.started) * 1000.0
+        slow = self.threshold_ms is not None and elapsed_ms >= self.threshold_ms
+        keep = slow or capture.sampled
+
+        # Walking the traced allocations is costly, so only kept calls pay
+        snapshot = None
+        if keep and self.capture_allocations and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+        if capture.owns_tracemalloc:
+            tracemalloc.stop()
+        self._active = False
+        if not keep:
+            return
+
+        if capture.offloaded:
+            stats = capture.offloaded_stats
+            if stats is None:
+                # The executor could not profile the body
+                return
+        else:
+            capture.profile.create_stats()
+            stats = capture.profile.stats
+
+        try:
+            self._write(
+                stats,
+                snapshot,
+                kind,
+                name,
+                elapsed_ms,
+                capture.sampled,
+                capture.offloaded,
+            )
+        except OSError as e:
+            logger.error(f"Failed to write profile for {kind} {name}: {e}")
+
+    def _write(
+        self,
+        stats: Dict[Any, Any],
+        snapshot: Optional[tracemalloc.Snapshot],
+        kind: str,
+        name: str,
+        elapsed_ms: float,
+        sampled: bool,
+        offloaded: bool,
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        safe_name = _UNSAFE_NAME_CHARS.sub("_", name)
+        stem = f"{self._sequence:06d}.{kind}.{safe_name}.{int(elapsed_ms)}ms"
+
+        profile_path = os.path.join(self.directory, stem + PROFILE_SUFFIX)
+        # Same format as cProfile.Profile.dump_stats, readable by pstats
+        with open(profile_path, "wb") as f:
+            marshal.dump(stats, f)
+
+        allocations_path = None
+        if snapshot is not None:
+            allocations_path = os.path.join(self.directory, stem + ALLOCATIONS_SUFFIX)
+            snapshot.dump(allocations_path)
+
+        self._captures.append(
+            {
+                "sequence": self._sequence,
+                "kind": kind,
+                "name": name,
+                "elapsed_ms": round(elapsed_ms, 3),
+                "sampled": sampled,
+                "offloaded": offloaded,
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+                "profile_path": profile_path,
+                "allocations_path": allocations_path,
+            }
+        )
+        logger.info(f"Captured profile for {kind} {name} ({elapsed_ms:.1f} ms)")
+        self._prune()
+        for callback in self._listeners:
+            callback(self._captures[-1])
+
+    def _prune(self) -> None:
+        """Delete the oldest captures beyond ``max_files``."""
+        while len(self._captures) > self.max_files:
+            entry = self._captures.popleft()
+            for path in (entry["profile_path"], entry["allocations_path"]):
+                if path is None:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Failed to remove old profile {path}: {e}")
+
+    def _load_existing(self) -> None:
+        """Adopt captures left in the directory by a previous run."""
+        if not os.path.isdir(self.directory):
+            return
+
+        for file_name in sorted(os.listdir(self.directory)):
+            if not file_name.endswith(PROFILE_SUFFIX):
+                continue
+            parts = file_name[: -len(PROFILE_SUFFIX)].split(".")
+            if len(parts) != 4 or not parts[0].isdigit():
+                continue
+            sequence, kind, name, elapsed = parts
+            stem = file_name[: -len(PROFILE_SUFFIX)]
+            allocations_path = os.path.join(self.directory, stem + ALLOCATIONS_SUFFIX)
+            profile_path = os.path.join(self.directory, file_name)
+            self._sequence = max(self._sequence, int(sequence))
+            self._captures.append(
+                {
+                    "sequence": int(sequence),
+                    "kind": kind,
+                    "name": name,
+                    "elapsed_ms": float(elapsed.rstrip("ms") or 0),
+                    "sampled": None,
+                    "offloaded": None,
+                    "captured_at": datetime.fromtimestamp(
+                        os.path.getmtime(profile_path), timezone.utc
+                    ).isoformat(),
+                    "profile_path": profile_path,
+                    "allocations_path": (
+                        allocations_path if os.path.exists(allocations_path) else None
+                    ),
+                }
+            )
+        self._prune()
@@ -1,19 +1,48 @@
 """Resources module for MCP server."""
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from pydantic import AnyUrl
 
 from ..config import ServerConfig
+from ..loop_monitor import EventLoopLagMonitor
+from ..profiling import SlowCallProfiler
+from ..sessions import SessionManager
+from ..tools.call_log import ToolCallLog
+from ..tools.coalescing import CallCoalescer
+from ..tools.offload import ToolOffloader
 from .example_resource import example_resource_reader
+from .json_resource import create_json_reader
+from .reader_resource import ReaderResource
+from .subscriptions import ResourceChangeHub
 
 logger = logging.getLogger(__name__)
 
 
-def get_resources(config: ServerConfig) -> List[Dict[str, Any]]:
+def get_resources(
+    config: ServerConfig,
+    profiler: Optional[SlowCallProfiler] = None,
+    sessions: Optional[SessionManager] = None,
+    coalescer: Optional[CallCoalescer] = None,
+    monitor: Optional[EventLoopLagMonitor] = None,
+    offloader: Optional[ToolOffloader] = None,
+    call_log: Optional[ToolCallLog] = None,
+) -> List[Dict[str, Any]]:
     """Get all resource definitions for the server.
 
+    A definition may include a ``watch`` hook. When the server supports
+    subscriptions the hook is called once with a ``ResourceEmitter``, which
+    the resource's producer uses to report appends and other changes.
+
     Args:
         config: Server configuration
+        profiler: Optional slow-call profiler whose captures are listed
+        sessions: Optional session manager whose statistics are reported
+        coalescer: Optional call coalescer whose statistics are reported
+        monitor: Optional event-loop lag monitor whose statistics are reported
+        offloader: Optional tool offloader reported alongside the lag
+        call_log: Optional log of tool calls exposed as an appended resource
 
     Returns:
         List of resource definitions
@@ -29,7 +58,129 @@ def get_resources(config: ServerConfig) -> List[Dict[str, Any]]:
         }
     )
 
+    # Add slow-call profile listing
+    if profiler is not None:
+
+        def profiles() -> Dict[str, Any]:
+            return {
+                "directory": profiler.directory,
+                "threshold_ms": profiler.threshold_ms,
+                "sample_rate": profiler.sample_rate,
+                "profiles": profiler.list_profiles(),
+            }
+
+        resources.append(
+            {
+                "name": "slow-call-profiles",
+                "description": "Profiles captured for slow or sampled calls",
+                "reader": create_json_reader(profiles),
+                "mime_type": "application/json",
+                "watch": lambda emitter: profiler.add_listener(
+                    lambda capture: emitter.changed()
+                ),
+            }
+        )
+
+    # Add session statistics
+    if sessions is not None:
+        resources.append(
+            {
+                "name": "session-stats",
+                "description": "Session counts and memory used per session",
+                "reader": create_json_reader(sessions.stats),
+                "mime_type": "application/json",
+            }
+        )
+
+    # Add tool call coalescing statistics
+    if coalescer is not None:
+        resources.append(
+            {
+                "name": "coalescing-stats",
+                "description": "Tool calls that shared an in-flight execution",
+                "reader": create_json_reader(coalescer.stats),
+                "mime_type": "application/json",
+            }
+        )
+
+    # Add event-loop lag and offloading statistics
+    if monitor is not None:
+
+        def event_loop_stats() -> Dict[str, Any]:
+            report = {"lag": monitor.stats()}
+            if offloader is not None:
+                report["offload"] = offloader.stats()
+            return report
+
+        resources.append(
+            {
+                "name": "event-loop-stats",
+                "description": "Event-loop lag and CPU-bound calls run off the loop",
+                "reader": create_json_reader(event_loop_stats),
+                "mime_type": "application/json",
+            }
+        )
+
+    # Add the log of tool calls, which grows by appends
+    if call_log is not None:
+        resources.append(
+            {
+                "name": "tool-call-log",
+                "description": "One line per finished tool call, oldest first",
+                "reader": call_log.reader,
+                "watch": call_log.watch,
+            }
+        )
+
     # Add more resources here...
 
     logger.debug(f"Loaded {len(resources)} resources")
     return resources
+
+
+def setup_resources(
+    server,
+    config: ServerConfig,
+    profiler: Optional[SlowCallProfiler] = None,
+    sessions: Optional[SessionManager] = None,
+    changes: Optional[ResourceChangeHub] = None,
+    coalescer: Optional[CallCoalescer] = None,
+    monitor: Optional[EventLoopLagMonitor] = None,
+    offloader: Optional[ToolOffloader] = None,
+    call_log: Optional[ToolCallLog] = None,
+) -> None:
+    """Register all resources with the server.
+
+    Each resource is exposed as ``resource://<name>``.
+
+    Args:
+        server: The FastMCP server instance
+        config: Server configuration
+        profiler: Optional slow-call profiler applied to every reader
+        sessions: Optional session manager whose statistics are exposed
+        changes: Optional change hub handed to each definition's watch hook
+        coalescer: Optional call coalescer whose statistics are exposed
+        monitor: Optional event-loop lag monitor whose statistics are exposed
+        offloader: Optional tool offloader reported alongside the lag
+        call_log: Optional log of tool calls exposed as an appended resource
+    """
+    for definition in get_resources(
+        config, profiler, sessions, coalescer, monitor, offloader, call_log
+    ):
+        reader = definition["reader"]
+        if profiler is not None:
+            reader = profiler.wrap_reader(definition["name"], reader)
+        if changes is not None and "watch" in definition:
+            definition["watch"](changes.emitter(definition["name"]))
+
+        server.add_resource(
+            ReaderResource(
+                uri=AnyUrl(f"resource://{definition['name']}"),
+                name=definition["name"],
+                description=definition["description"],
+                mime_type=definition.get("mime_type", "text/plain"),
+                reader=reader,
+            )
+        )
+
+    logger.info("Registered all resources with the server")
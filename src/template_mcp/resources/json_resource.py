@@ -0,0 +1,41 @@
+"""Resources reporting a JSON document built on every read."""
+
+import json
+import logging
+from typing import Any, AsyncGenerator, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def create_json_reader(
+    stats_fn: Callable[[], Any],
+) -> Callable[..., AsyncGenerator[Tuple[Dict[str, Any], bytes], None]]:
+    """Create a reader serving the current result of ``stats_fn`` as JSON.
+
+    Args:
+        stats_fn: Function returning a JSON-serializable report
+
+    Returns:
+        An async generator function usable as a resource reader
+    """
+
+    async def json_reader(
+        path: Optional[str] = None,
+    ) -> AsyncGenerator[Tuple[Dict[str, Any], bytes], None]:
+        """Report the current result of the statistics function.
+
+        Args:
+            path: Optional path parameter (unused)
+
+        Yields:
+            A single (metadata, content) tuple with a JSON report
+        """
+        content = json.dumps(stats_fn()).encode("utf-8")
+
+        metadata = {
+            "content_type": "application/json",
+            "total_size": len(content),
+        }
+        yield metadata, content
+
+    return json_reader
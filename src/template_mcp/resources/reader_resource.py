@@ -0,0 +1,34 @@
+"""Adapter exposing chunked resource readers as FastMCP resources."""
+
+import logging
+from typing import Any, AsyncGenerator, Callable, Dict, Tuple, Union
+
+from fastmcp.resources import Resource
+from pydantic import Field
+
+logger = logging.getLogger(__name__)
+
+ResourceReader = Callable[..., AsyncGenerator[Tuple[Dict[str, Any], bytes], None]]
+
+
+class ReaderResource(Resource):
+    """A resource whose content is produced by a chunked async reader."""
+
+    reader: ResourceReader = Field(exclude=True)
+
+    async def read(self) -> Union[str, bytes]:
+        """Read every chunk from the reader and join them.
+
+        Returns:
+            Text content for textual MIME types, bytes otherwise
+        """
+        chunks = []
+        content_type = self.mime_type
+        async for metadata, content in self.reader():
+            content_type = metadata.get("content_type", content_type)
+            chunks.append(content)
+
+        data = b"".join(chunks)
+        if content_type.startswith("text/") or content_type == "application/json":
+            return data.decode("utf-8")
+        return data
@@ -0,0 +1,413 @@
+"""Resource change events, subscription notifications and delta reads."""
+
+import asyncio
+import logging
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+import anyio
+from fastmcp.exceptions import ResourceError
+from fastmcp.resources import ResourceManager
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
+
+from ..config import ServerConfig
+from ..sessions import SessionManager
+from .reader_resource import ReaderResource
+
+logger = logging.getLogger(__name__)
+
+# Reads repeated when the resource changes while its content is read
+_READ_ATTEMPTS = 3
+
+
+def _is_textual(mime_type: str) -> bool:
+    return mime_type.startswith("text/") or mime_type == "application/json"
+
+
+class ResourceEmitter:
+    """Emits change events for one resource.
+
+    Handed to the ``watch`` hook of a resource definition. Producers call
+    ``append`` when bytes are added to the end of the resource and
+    ``changed`` for any other modification.
+    """
+
+    __slots__ = ("_hub", "uri")
+
+    def __init__(self, hub: "ResourceChangeHub", uri: str):
+        """Initialize the emitter.
+
+        Args:
+            hub: The hub receiving the events
+            uri: URI of the resource
+        """
+        self._hub = hub
+        self.uri = uri
+
+    def append(self, data: bytes) -> int:
+        """Report bytes appended to the resource.
+
+        Args:
+            data: The appended bytes
+
+        Returns:
+            The new resource version
+        """
+        return self._hub.publish_append(self.uri, data)
+
+    def changed(self) -> int:
+        """Report a change that is not a pure append.
+
+        Returns:
+            The new resource version
+        """
+        return self._hub.publish_change(self.uri)
+
+
+class _ResourceState:
+    """Version and recent appends of one resource."""
+
+    __slots__ = ("version", "appends", "buffered_bytes", "flush_handle")
+
+    def __init__(self):
+        self.version = 0
+        self.appends: Deque[Tuple[int, bytes]] = deque()
+        self.buffered_bytes = 0
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+
+class ResourceChangeHub:
+    """Tracks resource versions and notifies subscribed sessions.
+
+    Every change event bumps the version of its resource. Appended bytes are
+    kept in a per-resource buffer of at most ``buffer_bytes``, so a client
+    that knows an earlier version can read just the bytes added since. When
+    the buffer no longer covers that version, or the resource changed in a
+    way other than an append, the client gets the full content instead.
+
+    Notifications are debounced per resource: the first event schedules a
+    ``notifications/resources/updated`` message ``debounce`` seconds later,
+    and events arriving in the meantime are folded into it. Subscribers are
+    notified concurrently, and a send taking longer than ``notify_timeout``
+    seconds is abandoned so one slow client does not delay the others.
+    Events must be published from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        sessions: Optional[SessionManager] = None,
+        debounce: float = 0.05,
+        buffer_bytes: int = 1024 * 1024,
+        notify_timeout: float = 5.0,
+    ):
+        """Initialize the hub.
+
+        Args:
+            sessions: Session manager holding the subscriptions
+            debounce: Seconds to coalesce change events before notifying
+            buffer_bytes: Maximum appended bytes kept per resource for deltas
+            notify_timeout: Seconds to wait for each notification to be sent
+        """
+        self.sessions = sessions
+        self.debounce = debounce
+        self.buffer_bytes = buffer_bytes
+        self.notify_timeout = notify_timeout
+        self.notifications_sent = 0
+        self._states: Dict[str, _ResourceState] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._resource_manager: Optional[ResourceManager] = None
+
+    @classmethod
+    def from_config(
+        cls, config: ServerConfig, sessions: Optional[SessionManager] = None
+    ) -> "ResourceChangeHub":
+        """Create a hub from the server configuration.
+
+        Args:
+            config: Server configuration
+            sessions: Session manager holding the subscriptions
+
+        Returns:
+            A configured hub
+        """
+        return cls(
+            sessions=sessions,
+            debounce=config.resource_debounce_ms / 1000,
+            buffer_bytes=config.resource_delta_buffer_bytes,
+            notify_timeout=config.resource_notify_timeout,
+        )
+
+    def emitter(self, name: str) -> ResourceEmitter:
+        """Get an emitter for the resource registered under ``name``.
+
+        Args:
+            name: Resource name
+
+        Returns:
+            An emitter for ``resource://<name>``
+        """
+        return ResourceEmitter(self, f"resource://{name}")
+
+    def version(self, uri: str) -> int:
+        """Get the current version of a resource.
+
+        Args:
+            uri: URI of the resource
+
+        Returns:
+            The version, 0 if no change was ever published
+        """
+        state = self._states.get(uri)
+        return state.version if state is not None else 0
+
+    def publish_append(self, uri: str, data: bytes) -> int:
+        """Record bytes appended to a resource and schedule a notification.
+
+        Args:
+            uri: URI of the resource
+            data: The appended bytes
+
+        Returns:
+            The new resource version
+        """
+        state = self._state(uri)
+        state.version += 1
+        state.appends.append((state.version, data))
+        state.buffered_bytes += len(data)
+        while state.appends and state.buffered_bytes > self.buffer_bytes:
+            _, dropped = state.appends.popleft()
+            state.buffered_bytes -= len(dropped)
+        self._schedule(uri, state)
+        return state.version
+
+    def publish_change(self, uri: str) -> int:
+        """Record a non-append change to a resource and schedule a notification.
+
+        Args:
+            uri: URI of the resource
+
+        Returns:
+            The new resource version
+        """
+        state = self._state(uri)
+        state.version += 1
+        state.appends.clear()
+        state.buffered_bytes = 0
+        self._schedule(uri, state)
+        return state.version
+
+    def delta(self, uri: str, since_version: int) -> Optional[bytes]:
+        """Get the bytes appended to a resource after ``since_version``.
+
+        Args:
+            uri: URI of the resource
+            since_version: Version the client last saw
+
+        Returns:
+            The appended bytes, or None if the client must re-read everything
+        """
+        state = self._states.get(uri)
+        current = state.version if state is not None else 0
+        if since_version == current:
+            return b""
+        if state is None or since_version > current or not state.appends:
+            return None
+
+        first_version = state.appends[0][0]
+        if since_version + 1 < first_version:
+            return None
+        return b"".join(
+            data
+            for _, data in islice(
+                state.appends, since_version + 1 - first_version, None
+            )
+        )
+
+    def install(self, server) -> None:
+        """Attach the hub to a FastMCP server.
+
+        Advertises resource subscriptions and replaces the read handler with
+        one that understands the ``since_version``, ``offset`` and ``length``
+        query parameters. Must run before the session manager is installed
+        so that reads are tracked like any other request.
+
+        Args:
+            server: The FastMCP server instance
+        """
+        lowlevel = server._mcp_server
+        get_capabilities = lowlevel.get_capabilities
+
+        def capabilities(*args: Any, **kwargs: Any):
+            result = get_capabilities(*args, **kwargs)
+            if result.resources is not None and self.sessions is not None:
+                result.resources.subscribe = True
+            return result
+
+        lowlevel.get_capabilities = capabilities
+        lowlevel.read_resource()(self.read)
+        self._resource_manager = server._resource_manager
+        logger.info("Installed resource change hub")
+
+    async def read(self, uri: Union[AnyUrl, str]) -> List[ReadResourceContents]:
+        """Read a resource, a delta of it or a byte range of it.
+
+        ``resource://name`` returns the full content.
+        ``resource://name?since_version=N`` returns the bytes appended since
+        version N, or the full content if they are no longer available.
+        ``resource://name?offset=X&length=Y`` returns a slice of the content as
+        bytes. The ``_meta`` of the result carries the version to pass as
+        ``since_version`` next time and which kind of read was served.
+
+        Args:
+            uri: URI of the resource, optionally with query parameters
+
+        Returns:
+            A single-element list with the contents
+        """
+        if self._resource_manager is None:
+            raise ResourceError("Resource change hub is not installed")
+
+        parts = urlsplit(str(uri))
+        base_uri = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+        try:
+            query = {
+                key: int(values[-1]) for key, values in parse_qs(parts.query).items()
+            }
+        except ValueError:
+            raise ResourceError(f"Invalid query parameters in resource URI: {uri}")
+
+        resource = await self._resource_manager.get_resource(base_uri)
+        if not resource:
+            raise ResourceError(f"Unknown resource: {base_uri}")
+
+        if "offset" in query or "length" in query:
+            offset = query.get("offset", 0)
+            length = query.get("length")
+            if offset < 0 or (length is not None and length < 0):
+                raise ResourceError("offset and length must not be negative")
+
+        try:
+            # A change published while the content is read would make the
+            # version disagree with the content, so such reads are repeated
+            for _ in range(_READ_ATTEMPTS):
+                version = self.version(base_uri)
+                contents = await self._read_contents(resource, base_uri, query, version)
+                if self.version(base_uri) == version:
+                    return [contents]
+        except ResourceError:
+            raise
+        except Exception as e:
+            logger.error(f"Error reading resource {uri}: {e}")
+            raise ResourceError(str(e))
+        raise ResourceError(f"Resource {base_uri} kept changing while being read")
+
+    async def flush(self, uri: str) -> int:
+        """Notify every session subscribed to a resource now.
+
+        Args:
+            uri: URI of the resource
+
+        Returns:
+            Number of notifications sent
+        """
+        if self.sessions is None:
+            return 0
+
+        sent = 0
+
+        async def notify(session: Any) -> None:
+            nonlocal sent
+            with anyio.move_on_after(self.notify_timeout) as scope:
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception as e:
+                    logger.debug(f"Could not notify session about {uri}: {e}")
+                    return
+            if scope.cancelled_caught:
+                logger.debug(f"Timed out notifying session about {uri}")
+            else:
+                sent += 1
+
+        async with anyio.create_task_group() as tg:
+            for session in list(self.sessions.subscribers(uri)):
+                tg.start_soon(notify, session)
+
+        self.notifications_sent += sent
+        return sent
+
+    async def _read_contents(
+        self, resource: Any, base_uri: str, query: Dict[str, int], version: int
+    ) -> ReadResourceContents:
+        """Serve one read of a resource as of ``version``."""
+        mime_type = resource.mime_type
+        meta: Dict[str, Any] = {"version": version}
+
+        if "since_version" in query:
+            meta["since_version"] = query["since_version"]
+            data = self.delta(base_uri, query["since_version"])
+            if data is not None:
+                meta["delta"] = "append"
+                content = data.decode("utf-8") if _is_textual(mime_type) else data
+                return ReadResourceContents(content, mime_type, meta)
+
+        if "offset" in query or "length" in query:
+            offset = query.get("offset", 0)
+            meta.update(delta="range", offset=offset)
+            data = await self._read_range(resource, offset, query.get("length"))
+            return ReadResourceContents(data, mime_type, meta)
+
+        meta["delta"] = "full"
+        return ReadResourceContents(await resource.read(), mime_type, meta)
+
+    def _state(self, uri: str) -> _ResourceState:
+        state = self._states.get(uri)
+        if state is None:
+            state = self._states[uri] = _ResourceState()
+        return state
+
+    def _schedule(self, uri: str, state: _ResourceState) -> None:
+        """Schedule a debounced notification unless one is pending."""
+        if state.flush_handle is not None or self.sessions is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop, so no session can be listening
+            return
+        state.flush_handle = loop.call_later(self.debounce, self._start_flush, uri)
+
+    def _start_flush(self, uri: str) -> None:
+        self._states[uri].flush_handle = None
+        task = asyncio.get_running_loop().create_task(self.flush(uri))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read_range(
+        self, resource: Any, offset: int, length: Optional[int]
+    ) -> bytes:
+        """Read ``length`` bytes at ``offset``, streaming chunked readers."""
+        end = None if length is None else offset + length
+        if not isinstance(resource, ReaderResource):
+            data = await resource.read()
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            return data[offset:end]
+
+        chunks = []
+        position = 0
+        reader = resource.reader()
+        try:
+            async for _, chunk in reader:
+                chunk_end = position + len(chunk)
+                if chunk_end > offset:
+                    stop = None if end is None else end - position
+                    chunks.append(chunk[max(offset - position, 0) : stop])
+                position = chunk_end
+                if end is not None and position >= end:
+                    break
+        finally:
+            await reader.aclose()
+        return b"".join(chunks)
@@ -1,15 +1,37 @@
 """Server implementation for the Template MCP."""
 
 import logging
-from typing import Literal, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Literal, Optional
+
+import anyio
 from fastmcp import FastMCP
+from mcp import ClientSession
 from template_mcp.config import ServerConfig
+from template_mcp.loop_monitor import EventLoopLagMonitor
+from template_mcp.memory_transport import connect_in_memory
+from template_mcp.profiling import SlowCallProfiler
+from template_mcp.resources import setup_resources
+from template_mcp.resources.subscriptions import ResourceChangeHub
+from template_mcp.sessions import SessionManager
+from template_mcp.sse_transport import serve_sse
+from template_mcp.tools import setup_tools
+from template_mcp.tools.call_log import ToolCallLog
+from template_mcp.tools.coalescing import CallCoalescer
+from template_mcp.tools.offload import ToolOffloader
 
 logger = logging.getLogger(__name__)
 
 
 class TemplateMCPServer:
-    """Template Model Context Protocol Server."""
+    """Template Model Context Protocol Server.
+
+    Owns the FastMCP server together with the state shared by its tools and
+    resources: the slow-call profiler, the per-session state store, the
+    hub publishing resource changes to subscribers, the coalescer of
+    identical tool calls, the executors for CPU-bound tools, the
+    event-loop lag monitor and the log of tool calls.
+    """
 
     def __init__(self, config: ServerConfig):
         """Initialize the MCP server.
@@ -18,12 +40,78 @@ class TemplateMCPServer:
             config: Server configuration
         """
         self.config = config
-        self.server: FastMCP = FastMCP(log_level="DEBUG" if config.debug else "INFO")
+        self.server: FastMCP = create_server(config)
+        self.profiler = SlowCallProfiler.from_config(config)
+        self.sessions = SessionManager.from_config(config)
+        self.changes = ResourceChangeHub.from_config(config, self.sessions)
+        self.coalescer = CallCoalescer(enabled=config.coalesce_tool_calls)
+        self.offloader = ToolOffloader.from_config(
+            config, profiler=self.profiler
+        )
+        self.monitor = EventLoopLagMonitor.from_config(config)
+        self.call_log = ToolCallLog.from_config(config)
+
+        setup_tools(
+            self.server,
+            config,
+            profiler=self.profiler,
+            sessions=self.sessions,
+            coalescer=self.coalescer,
+            offloader=self.offloader,
+            call_log=self.call_log,
+        )
+        setup_resources(
+            self.server,
+            config,
+            profiler=self.profiler,
+            sessions=self.sessions,
+            changes=self.changes,
+            coalescer=self.coalescer,
+            monitor=self.monitor,
+            offloader=self.offloader,
+            call_log=self.call_log,
+        )
+        self.changes.install(self.server)
+        # Installed last so the session manager wraps every request handler
+        self.sessions.install(self.server)
+
+    def run(self, transport: str = "stdio"):
+        """Run the server with the specified transport.
+
+        Args:
+            transport: Transport protocol to use (stdio or sse)
+        """
+        anyio.run(self.start, transport)
+
+    @asynccontextmanager
+    async def connect(self, **kwargs: Any) -> AsyncIterator[ClientSession]:
+        """Connect an in-process client session to this server.
 
-    async def start(self):
-        """Start the server."""
+        Args:
+            **kwargs: Keyword arguments for ``connect_in_memory``
+
+        Yields:
+            An initialized client session
+        """
+        async with self.monitor.running():
+            async with connect_in_memory(self.server, **kwargs) as session:
+                yield session
+
+    async def start(self, transport: str = "stdio"):
+        """Start the server on the running event loop.
+
+        Args:
+            transport: Transport protocol to use (stdio or sse)
+        """
         logger.info("Starting Template MCP server")
-        await self.server.start()
+        try:
+            async with self.monitor.running():
+                if transport == "stdio":
+                    await self.server.run_stdio_async()
+                else:
+                    await serve_sse(self.server, self.config)
+        finally:
+            self.offloader.shutdown()
 
 
 def create_server(config: ServerConfig) -> FastMCP:
@@ -40,16 +128,25 @@ def create_server(config: ServerConfig) -> FastMCP:
     return server
 
 
-def run_server(server: FastMCP, transport: str = "stdio"):
+def run_server(
+    server: FastMCP, transport: str = "stdio", config: Optional[ServerConfig] = None
+):
     """Run the server with the specified transport.
     
+    The SSE transport compresses responses as configured by
+    ``config.compression_encodings``.
+
     Args:
         server: The FastMCP server instance
         transport: Transport protocol to use (stdio or sse)
+        config: Server configuration, defaults to ``ServerConfig()``
     """
     # Use the appropriate transport type
     transport_type: Optional[Literal['stdio', 'sse']] = 'stdio' if transport == 'stdio' else 'sse'
-    server.run(transport=transport_type)
+    if transport_type == 'stdio':
+        server.run(transport=transport_type)
+    else:
+        anyio.run(serve_sse, server, config or ServerConfig())
 
 
 def main() -> None:
@@ -57,8 +154,7 @@ def main() -> None:
     # Create and run the server
     from template_mcp.config import ServerConfig
     config = ServerConfig(debug=True)
-    server = create_server(config)
-    run_server(server)
+    TemplateMCPServer(config).run()
 
 
 if __name__ == "__main__":
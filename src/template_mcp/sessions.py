@@ -0,0 +1,523 @@
+"""Per-session state for connected MCP clients."""
+
+import logging
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set
+
+from mcp import types
+from pydantic import AnyUrl
+
+from .config import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _LocalSession:
+    """Session placeholder for calls made outside of an MCP request."""
+
+
+_EMPTY_CACHE_BYTES = sys.getsizeof(OrderedDict())
+# Each cache entry is stored as a (value, size) tuple
+_CACHE_TUPLE_BYTES = sys.getsizeof((None, 0))
+
+
+def _cache_slot_bytes(samples: int = 1024) -> int:
+    """Measure the most one entry adds to the size of an ``OrderedDict``.
+
+    Spare table slots left by a resize are included, so a cache holding
+    ``n`` entries never takes more than ``n`` times this beyond an empty one.
+    """
+    cache: "OrderedDict[int, None]" = OrderedDict()
+    worst = 0
+    for count in range(1, samples + 1):
+        cache[count] = None
+        growth = sys.getsizeof(cache) - _EMPTY_CACHE_BYTES
+        worst = max(worst, -(-growth // count))
+    return worst
+
+
+_CACHE_SLOT_BYTES = _cache_slot_bytes()
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory held by a cached value.
+
+    Args:
+        value: The value to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class SessionRecord:
+    """Compact state kept for one client session.
+
+    Subscriptions and the cache are allocated on first use so that sessions
+    which never use them only pay for the record itself.
+    """
+
+    __slots__ = (
+        "session_id",
+        "created_at",
+        "last_seen",
+        "active_requests",
+        "log_level",
+        "subscriptions",
+        "cache",
+        "cache_bytes",
+        "memory_budget",
+        "_session_ref",
+    )
+
+    def __init__(self, session_id: int, now: float, memory_budget: int):
+        """Initialize the record.
+
+        Args:
+            session_id: Identifier of the session within the manager
+            now: Current monotonic time
+            memory_budget: Maximum bytes held by the per-session cache
+        """
+        self.session_id = session_id
+        self.created_at = now
+        self.last_seen = now
+        self.active_requests = 0
+        self.log_level: Optional[types.LoggingLevel] = None
+        self.subscriptions: Optional[Set[str]] = None
+        self.cache: Optional["OrderedDict[str, Any]"] = None
+        self.cache_bytes = 0
+        self.memory_budget = memory_budget
+        self._session_ref: Optional[weakref.ref] = None
+
+    @property
+    def session(self) -> Optional[Any]:
+        """The live session object, or None once it has been closed."""
+        return self._session_ref() if self._session_ref is not None else None
+
+    def subscribe(self, uri: str) -> None:
+        """Record a resource subscription.
+
+        Args:
+            uri: URI of the subscribed resource
+        """
+        if self.subscriptions is None:
+            self.subscriptions = set()
+        self.subscriptions.add(uri)
+
+    def unsubscribe(self, uri: str) -> None:
+        """Remove a resource subscription.
+
+        Args:
+            uri: URI of the resource
+        """
+        if self.subscriptions is not None:
+            self.subscriptions.discard(uri)
+            if not self.subscriptions:
+                self.subscriptions = None
+
+    def cache_get(self, key: str, default: Any = None) -> Any:
+        """Get a value from the session cache.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+
+        Returns:
+            The cached value or ``default``
+        """
+        if self.cache is None:
+            return default
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.cache.move_to_end(key)
+        return value[0]
+
+    def cache_put(
+        self, key: str, value: Any, size: Optional[int] = None, evict: bool = True
+    ) -> bool:
+        """Store a value in the session cache within the memory budget.
+
+        Least recently used entries are evicted to make room unless
+        ``evict`` is False. Each entry is charged for its key and the cache's
+        own bookkeeping as well as the value, so the cache never holds more
+        than the budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size: Size of the value in bytes, estimated when omitted
+            evict: Whether other entries may be evicted to make room
+
+        Returns:
+            True if the value was stored, False if it does not fit
+        """
+        if size is None:
+            size = estimate_size(value)
+        size += sys.getsizeof(key) + _CACHE_TUPLE_BYTES + _CACHE_SLOT_BYTES
+        if size > self.memory_budget:
+            return False
+
+        self.cache_pop(key)
+        if not evict and self.cache_bytes + size > self.memory_budget:
+            return False
+        if self.cache is None:
+            self.cache = OrderedDict()
+        evicted = False
+        while self.cache and self.cache_bytes + size > self.memory_budget:
+            _, (_, evicted_size) = self.cache.popitem(last=False)
+            self.cache_bytes -= evicted_size
+            evicted = True
+        if evicted:
+            self._compact_cache()
+        self.cache[key] = (value, size)
+        self.cache_bytes += size
+        return True
+
+    def cache_pop(self, key: str, default: Any = None) -> Any:
+        """Remove a value from the session cache.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+
+        Returns:
+            The removed value or ``default``
+        """
+        if self.cache is None or key not in self.cache:
+            return default
+        value, size = self.cache.pop(key)
+        self.cache_bytes -= size
+        if not self.cache:
+            self.cache = None
+        else:
+            self._compact_cache()
+        return value
+
+    def cache_keys(self, prefix: str = "") -> List[str]:
+        """List the keys in the session cache, least recently used first.
+
+        Args:
+            prefix: Only list keys starting with this prefix
+
+        Returns:
+            The matching keys
+        """
+        if self.cache is None:
+            return []
+        return [key for key in self.cache if key.startswith(prefix)]
+
+    def memory_usage(self) -> int:
+        """Estimate the bytes held by this record.
+
+        Only the record and the state it owns are counted: the transport's
+        ``ServerSession``, its memory streams and the task group serving it
+        live outside the record and are not included.
+
+        Returns:
+            Approximate size in bytes
+        """
+        size = sys.getsizeof(self)
+        if self.subscriptions is not None:
+            size += sys.getsizeof(self.subscriptions)
+            size += sum(sys.getsizeof(uri) for uri in self.subscriptions)
+        if self.cache is not None:
+            # Replace the charged slot estimate with the table's real size
+            size += sys.getsizeof(self.cache)
+            size += self.cache_bytes - len(self.cache) * _CACHE_SLOT_BYTES
+        return size
+
+    def _compact_cache(self) -> None:
+        """Rebuild the cache once removals leave its table oversized.
+
+        Dict tables do not shrink when entries are removed, so without this
+        the table could outgrow the slots charged to the remaining entries.
+        """
+        assert self.cache is not None
+        slots = sys.getsizeof(self.cache) - _EMPTY_CACHE_BYTES
+        if slots > len(self.cache) * _CACHE_SLOT_BYTES:
+            self.cache = OrderedDict(self.cache)
+
+
+class SessionManager:
+    """Tracks per-session state with idle-timeout and LRU eviction.
+
+    Records are kept in least-recently-used order. Sessions idle for longer
+    than ``idle_timeout`` are evicted, and once ``max_sessions`` records
+    exist the least recently used idle session is evicted to make room.
+    Sessions with requests in flight are never evicted, and sessions holding
+    resource subscriptions are not evicted for being idle. A session that
+    returns after eviction starts again with a fresh record.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        idle_timeout: float = 900.0,
+        session_memory_budget: int = 64 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the session manager.
+
+        Args:
+            max_sessions: Maximum number of session records kept
+            idle_timeout: Seconds of inactivity before a session is evicted
+            session_memory_budget: Maximum bytes held by each session cache
+            clock: Monotonic clock, overridable for testing
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.session_memory_budget = session_memory_budget
+        self._clock = clock
+        self._records: "OrderedDict[int, SessionRecord]" = OrderedDict()
+        self._last_sweep = clock()
+        self._server = None
+        self._local_session = _LocalSession()
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "SessionManager":
+        """Create a session manager from the server configuration.
+
+        Args:
+            config: Server configuration
+
+        Returns:
+            A configured session manager
+        """
+        return cls(
+            max_sessions=config.max_sessions,
+            idle_timeout=config.session_idle_timeout,
+            session_memory_budget=config.session_memory_budget,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of tracked sessions."""
+        return len(self._records)
+
+    def install(self, server) -> None:
+        """Attach the manager to a FastMCP server.
+
+        Registers the logging-level and subscription handlers and wraps every
+        request handler so each request refreshes its session record.
+
+        Args:
+            server: The FastMCP server instance
+        """
+        lowlevel = server._mcp_server
+        lowlevel.set_logging_level()(self._set_logging_level)
+        lowlevel.subscribe_resource()(self._subscribe)
+        lowlevel.unsubscribe_resource()(self._unsubscribe)
+        for request_type, handler in list(lowlevel.request_handlers.items()):
+            lowlevel.request_handlers[request_type] = self._track(handler)
+        self._server = lowlevel
+        logger.info("Installed session manager")
+
+    def current(self) -> Optional[SessionRecord]:
+        """Get the record of the session serving the current request.
+
+        Returns:
+            The session record, or None outside of a request
+        """
+        if self._server is None:
+            return None
+        try:
+            session = self._server.request_context.session
+        except LookupError:
+            return None
+        return self.get(session)
+
+    def for_request(self) -> SessionRecord:
+        """Get the current session record, falling back to a local record.
+
+        Calls made outside of an MCP request, such as direct in-process
+        calls to a tool function, share a single local record.
+
+        Returns:
+            The session record
+        """
+        record = self.current()
+        if record is None:
+            record = self.get(self._local_session)
+        return record
+
+    def get(self, session: Any) -> SessionRecord:
+        """Get or create the record for a session.
+
+        Args:
+            session: The session object
+
+        Returns:
+            The session record
+        """
+        now = self._clock()
+        if now - self._last_sweep >= min(self.idle_timeout, 60.0):
+            self.evict_idle(now)
+
+        key = id(session)
+        record = self._records.get(key)
+        if record is not None and record.session is session:
+            record.last_seen = now
+            self._records.move_to_end(key)
+            return record
+
+        if len(self._records) >= self.max_sessions:
+            self._evict_lru()
+
+        record = SessionRecord(key, now, self.session_memory_budget)
+        record._session_ref = weakref.ref(session, self._forget(key))
+        self._records[key] = record
+        return record
+
+    def remove(self, session: Any) -> None:
+        """Drop the record for a session.
+
+        Args:
+            session: The session object
+        """
+        record = self._records.get(id(session))
+        if record is not None and record.session is session:
+            del self._records[id(session)]
+
+    def records(self):
+        """Iterate over tracked session records, least recently used first."""
+        return iter(list(self._records.values()))
+
+    def subscribers(self, uri: str) -> Iterator[Any]:
+        """Iterate over the live sessions subscribed to a resource.
+
+        Args:
+            uri: URI of the resource
+
+        Yields:
+            Session objects
+        """
+        for record in list(self._records.values()):
+            if record.subscriptions is not None and uri in record.subscriptions:
+                session = record.session
+                if session is not None:
+                    yield session
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Evict sessions idle for longer than the idle timeout.
+
+        Args:
+            now: Current monotonic time, defaults to the clock
+
+        Returns:
+            Number of evicted sessions
+        """
+        if now is None:
+            now = self._clock()
+        self._last_sweep = now
+
+        evicted = 0
+        for key, record in list(self._records.items()):
+            if now - record.last_seen < self.idle_timeout:
+                # Records are in LRU order; the rest are newer
+                break
+            if record.active_requests or record.subscriptions:
+                # Subscribers wait quietly for notifications
+                continue
+            del self._records[key]
+            evicted += 1
+
+        if evicted:
+            self.evicted_idle += evicted
+            logger.debug(f"Evicted {evicted} idle sessions")
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize session memory usage.
+
+        Byte counts cover the session records only, as measured by
+        :meth:`SessionRecord.memory_usage`; transport objects are excluded.
+
+        Returns:
+            Dictionary with session counts, byte totals and eviction counters
+        """
+        sizes = [record.memory_usage() for record in self._records.values()]
+        total = sum(sizes)
+        return {
+            "sessions": len(sizes),
+            "active_sessions": sum(
+                1 for record in self._records.values() if record.active_requests
+            ),
+            "total_bytes": total,
+            "bytes_per_session": total // len(sizes) if sizes else 0,
+            "max_session_bytes": max(sizes, default=0),
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout,
+            "session_memory_budget": self.session_memory_budget,
+            "evicted_idle": self.evicted_idle,
+            "evicted_capacity": self.evicted_capacity,
+        }
+
+    def _evict_lru(self) -> None:
+        """Evict the least recently used idle, unsubscribed session."""
+        for key, record in self._records.items():
+            if not (record.active_requests or record.subscriptions):
+                del self._records[key]
+                self.evicted_capacity += 1
+                return
+        logger.warning(
+            f"All {len(self._records)} sessions are busy or subscribed; "
+            "exceeding max_sessions"
+        )
+
+    def _forget(self, key: int) -> Callable[[weakref.ref], None]:
+        """Build a weakref callback dropping the record of a closed session."""
+
+        def callback(ref: weakref.ref) -> None:
+            record = self._records.get(key)
+            if record is not None and record._session_ref is ref:
+                del self._records[key]
+
+        return callback
+
+    def _track(
+        self, handler: Callable[[Any], Awaitable[Any]]
+    ) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap a request handler so it refreshes the session record."""
+
+        async def tracked_handler(request: Any) -> Any:
+            record = self.current()
+            if record is None:
+                return await handler(request)
+            record.active_requests += 1
+            try:
+                return await handler(request)
+            finally:
+                record.active_requests -= 1
+                record.last_seen = self._clock()
+                if self._records.get(record.session_id) is record:
+                    self._records.move_to_end(record.session_id)
+
+        return tracked_handler
+
+    async def _set_logging_level(self, level: types.LoggingLevel) -> None:
+        record = self.current()
+        if record is not None:
+            record.log_level = level
+
+    async def _subscribe(self, uri: AnyUrl) -> None:
+        record = self.current()
+        if record is not None:
+            record.subscribe(str(uri))
+
+    async def _unsubscribe(self, uri: AnyUrl) -> None:
+        record = self.current()
+        if record is not None:
+            record.unsubscribe(str(uri))
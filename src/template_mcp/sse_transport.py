@@ -0,0 +1,90 @@
+"""SSE transport with negotiated response compression."""
+
+import logging
+
+import uvicorn
+from fastmcp import FastMCP
+from mcp.server.sse import SseServerTransport
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from .compression import CompressionMiddleware
+from .config import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+
+def create_sse_app(server: FastMCP, config: ServerConfig) -> Starlette:
+    """Build the ASGI application serving a server over SSE.
+
+    Clients open the event stream at ``/sse`` and post messages to the
+    ``/messages/`` endpoint it announces. Responses are compressed with an
+    encoding negotiated per client when ``config.compression_encodings`` is
+    not empty. ``config.compression_min_size`` only affects responses outside the
+    event stream; results travel over the stream, which is always
+    compressed.
+
+    Args:
+        server: The FastMCP server instance
+        config: Server configuration
+
+    Returns:
+        The Starlette application
+    """
+    lowlevel = server._mcp_server
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request):
+        async with sse.connect_sse(
+            request.scope, request.receive, request._send
+        ) as streams:
+            await lowlevel.run(
+                streams[0],
+                streams[1],
+                lowlevel.create_initialization_options(),
+            )
+        return Response()
+
+    middleware = []
+    if config.compression_encodings:
+        middleware.append(
+            Middleware(
+                CompressionMiddleware,
+                minimum_size=config.compression_min_size,
+                encodings=config.compression_encodings,
+                levels=config.compression_levels,
+            )
+        )
+
+    return Starlette(
+        debug=server.settings.debug,
+        routes=[
+            Route("/sse", endpoint=handle_sse),
+            Mount("/messages/", app=sse.handle_post_message),
+        ],
+        middleware=middleware,
+    )
+
+
+async def serve_sse(server: FastMCP, config: ServerConfig) -> None:
+    """Serve a server over SSE until the process is stopped.
+
+    Listens on the host and port from the FastMCP settings.
+
+    Args:
+        server: The FastMCP server instance
+        config: Server configuration
+    """
+    uvicorn_config = uvicorn.Config(
+        create_sse_app(server, config),
+        host=server.settings.host,
+        port=server.settings.port,
+        log_level=server.settings.log_level.lower(),
+    )
+    logger.info(
+        f"Serving SSE on {server.settings.host}:{server.settings.port} "
+        f"(compression: {', '.join(config.compression_encodings) or 'off'})"
+    )
+    await uvicorn.Server(uvicorn_config).serve()
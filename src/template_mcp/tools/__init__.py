@@ -1,21 +1,79 @@
 """Tools module for MCP server."""
 
 import logging
-from typing import Union
+from typing import List, Optional, Union
 from ..config import ServerConfig
+from ..profiling import SlowCallProfiler
+from ..sessions import SessionManager
+from .call_log import ToolCallLog
+from .coalescing import CallCoalescer
 from .example_tool import register_tools
+from .incremental_count import register_incremental_tools
+from .offload import ToolOffloader
+from .profiling_tool import register_profiling_tools
+from .registration import ToolMiddleware, ToolRegistrar
 
 logger = logging.getLogger(__name__)
 
 
-def setup_tools(server, config: Union[ServerConfig, None] = None) -> None:
+def setup_tools(
+    server,
+    config: Union[ServerConfig, None] = None,
+    profiler: Optional[SlowCallProfiler] = None,
+    sessions: Optional[SessionManager] = None,
+    coalescer: Optional[CallCoalescer] = None,
+    offloader: Optional[ToolOffloader] = None,
+    call_log: Optional[ToolCallLog] = None,
+) -> None:
     """Set up all tools for the server.
     
     Args:
         server: The FastMCP server instance
         config: Server configuration
+        profiler: Optional slow-call profiler applied to every tool
+        sessions: Optional session manager holding per-session tool state;
+            it must be installed on the server for state to be kept per
+            client. Without one, the incremental count tools keep their
+            handles in a single record shared by every client, which only
+            suits single-tenant servers
+        coalescer: Optional call coalescer for tools registered with
+            ``coalesce=True``
+        offloader: Optional offloader for tools registered with ``cpu_bound``
+        call_log: Optional log recording every tool call
     """
+    if config is None:
+        config = ServerConfig()
+
+    middleware: List[ToolMiddleware] = []
+    if call_log is not None:
+        # Outermost, so every caller of a coalesced execution is logged
+        middleware.append(call_log)
+    if coalescer is not None:
+        # Outside the profiler, so a shared execution is profiled once
+        middleware.append(coalescer)
+    if profiler is not None:
+        middleware.append(profiler)
+    if offloader is not None:
+        # Innermost, so the raw tool function is sent to the executor; the
+        # offloader profiles the calls it sends there in the worker
+        middleware.append(offloader)
+    registrar = ToolRegistrar(server, middleware)
+
     # Register example tools
-    register_tools(server)
+    register_tools(registrar)
+
+    # Register incremental analysis tools
+    if sessions is None:
+        logger.warning(
+            "No session manager given; count-chars handles are shared by all clients"
+        )
+        sessions = SessionManager.from_config(config)
+    register_incremental_tools(
+        registrar, sessions=sessions, handle_ttl=config.count_handle_ttl
+    )
+
+    # Register the runtime profiler control when the operator enables it
+    if profiler is not None and config.profile_control:
+        register_profiling_tools(registrar, profiler)
     
-    logger.info("Registered all tools with the server") 
\ No newline at end of file
+    logger.info("Registered all tools with the server")
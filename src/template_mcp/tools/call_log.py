@@ -0,0 +1,126 @@
+"""Append-only log of tool calls, served as a subscribable resource."""
+
+import functools
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from ..config import ServerConfig
+from .registration import ToolFunction
+
+logger = logging.getLogger(__name__)
+
+
+class ToolCallLog:
+    """Tool middleware recording one line per call in a bounded buffer.
+
+    Each line holds the time the call finished, the tool name, the elapsed
+    milliseconds and the outcome (``ok``, ``error`` or ``exception``). The
+    same buffer backs the ``tool-call-log`` resource, and every line added
+    is reported to the watching emitters as an append. When the buffer
+    would grow past ``max_bytes`` the oldest lines are dropped and a
+    change is reported instead, since the content no longer only grew.
+    Lines must be added from the event loop thread.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024):
+        """Initialize the log.
+
+        Args:
+            max_bytes: Maximum size of the log in bytes
+        """
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._emitters: List[Any] = []
+
+    @classmethod
+    def from_config(cls, config: ServerConfig) -> "ToolCallLog":
+        """Create a log from the server configuration.
+
+        Args:
+            config: Server configuration
+
+        Returns:
+            A configured log
+        """
+        return cls(max_bytes=config.tool_call_log_bytes)
+
+    def wrap_tool(
+        self, name: str, func: ToolFunction, options: Dict[str, Any]
+    ) -> ToolFunction:
+        """Wrap a tool so each call is recorded once it finishes.
+
+        Args:
+            name: Name of the tool
+            func: The async tool function
+            options: Tool registration options (unused)
+
+        Returns:
+            The wrapped tool function
+        """
+
+        @functools.wraps(func)
+        async def logged_tool(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            outcome = "exception"
+            try:
+                result = await func(*args, **kwargs)
+                is_error = isinstance(result, dict) and result.get("isError")
+                outcome = "error" if is_error else "ok"
+                return result
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.record(name, elapsed_ms, outcome)
+
+        return logged_tool
+
+    def record(self, name: str, elapsed_ms: float, outcome: str) -> None:
+        """Add a line for a finished call and report it to the emitters.
+
+        Args:
+            name: Name of the tool
+            elapsed_ms: Duration of the call in milliseconds
+            outcome: ``ok``, ``error`` or ``exception``
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        line = f"{now} {name} {elapsed_ms:.1f}ms {outcome}\n".encode("utf-8")
+
+        self._buffer += line
+        if len(self._buffer) <= self.max_bytes:
+            for emitter in self._emitters:
+                emitter.append(line)
+            return
+
+        # Drop whole lines from the start until the log fits again; the
+        # buffer ends with a newline, so one is always found
+        excess = len(self._buffer) - self.max_bytes
+        del self._buffer[: self._buffer.find(b"\n", excess - 1) + 1]
+        for emitter in self._emitters:
+            emitter.changed()
+
+    def watch(self, emitter: Any) -> None:
+        """Report every future change of the log to ``emitter``.
+
+        Args:
+            emitter: A ``ResourceEmitter`` for the log resource
+        """
+        self._emitters.append(emitter)
+
+    async def reader(
+        self, path: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[Dict[str, Any], bytes], None]:
+        """Read the current log.
+
+        Args:
+            path: Optional path parameter (unused)
+
+        Yields:
+            A single (metadata, content) tuple with the log lines
+        """
+        content = bytes(self._buffer)
+        metadata = {
+            "content_type": "text/plain",
+            "total_size": len(content),
+        }
+        yield metadata, content
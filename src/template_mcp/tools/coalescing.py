@@ -0,0 +1,156 @@
+"""Single-flight coalescing of identical concurrent tool calls."""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from .registration import ToolFunction
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlight:
+    """A shared execution and the number of callers waiting for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class CallCoalescer:
+    """Tool middleware sharing one execution between identical calls.
+
+    Tools opt in with ``coalesce=True`` at registration. While a call is in
+    flight, further calls to the same tool with equal validated arguments
+    wait for it and receive its result (or its exception) instead of
+    running again. Nothing is cached: once the execution finishes, the next
+    call runs afresh. A caller that is cancelled stops waiting without
+    affecting the others, and the execution itself is cancelled only when
+    every caller has gone.
+
+    Only tools whose result depends on nothing but their arguments should
+    opt in; tools that touch per-session state must not.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """Initialize the coalescer.
+
+        Args:
+            enabled: Whether calls are coalesced; when False tools run as is
+        """
+        self.enabled = enabled
+        self._in_flight: Dict[Tuple[str, bytes], _InFlight] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def wrap_tool(
+        self, name: str, func: ToolFunction, options: Dict[str, Any]
+    ) -> ToolFunction:
+        """Wrap a tool so identical concurrent calls share one execution.
+
+        Args:
+            name: Name of the tool
+            func: The async tool function
+            options: Tool registration options; ``coalesce`` enables sharing
+
+        Returns:
+            The wrapped tool function, or ``func`` if the tool did not opt in
+        """
+        if not options.get("coalesce"):
+            return func
+
+        signature = inspect.signature(func)
+        stats = self._stats.setdefault(
+            name, {"calls": 0, "executions": 0, "coalesced": 0}
+        )
+
+        @functools.wraps(func)
+        async def coalesced_tool(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return await func(*args, **kwargs)
+
+            stats["calls"] += 1
+            key = self._key(name, signature, args, kwargs)
+            if key is None:
+                stats["executions"] += 1
+                return await func(*args, **kwargs)
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                stats["executions"] += 1
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                in_flight = self._in_flight[key] = _InFlight(task)
+                task.add_done_callback(functools.partial(self._finished, key))
+            else:
+                stats["coalesced"] += 1
+                logger.debug(f"Coalesced call to {name} with an in-flight call")
+
+            in_flight.waiters += 1
+            try:
+                return await asyncio.shield(in_flight.task)
+            finally:
+                in_flight.waiters -= 1
+                if in_flight.waiters == 0 and not in_flight.task.done():
+                    # The last caller gave up; nobody needs the result
+                    self._forget(key, in_flight)
+                    in_flight.task.cancel()
+
+        return coalesced_tool
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize coalescing per tool.
+
+        Returns:
+            Dictionary with totals and per-tool calls, executions and
+            coalesced calls
+        """
+        tools = {name: dict(counts) for name, counts in self._stats.items()}
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._in_flight),
+            "calls": sum(counts["calls"] for counts in tools.values()),
+            "coalesced": sum(counts["coalesced"] for counts in tools.values()),
+            "tools": tools,
+        }
+
+    def _key(
+        self,
+        name: str,
+        signature: inspect.Signature,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Optional[Tuple[str, bytes]]:
+        """Build the coalescing key, or None if the arguments are not JSON.
+
+        The key holds a digest of the serialized arguments rather than the
+        serialization itself, so an in-flight call with megabytes of input
+        does not keep a second copy of it alive, and lookups compare 32
+        bytes instead of the whole input.
+        """
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            return None
+        bound.apply_defaults()
+        arguments = {
+            key: value for key, value in bound.arguments.items() if key != "ctx"
+        }
+        try:
+            serialized = json.dumps(arguments, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return name, hashlib.sha256(serialized.encode("utf-8")).digest()
+
+    def _finished(self, key: Tuple[str, bytes], task: asyncio.Task) -> None:
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight.task is task:
+            del self._in_flight[key]
+
+    def _forget(self, key: Tuple[str, bytes], in_flight: _InFlight) -> None:
+        if self._in_flight.get(key) is in_flight:
+            del self._in_flight[key]
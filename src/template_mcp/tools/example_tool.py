@@ -7,6 +7,7 @@ from mcp.server.fastmcp import Context
 from pydantic import BaseModel, Field, ValidationError
 
 from .input_validation import create_error_result, create_success_result
+from .registration import as_registrar
 
 logger = logging.getLogger(__name__)
 
@@ -23,16 +24,71 @@ class CountCharsParams(BaseModel):
     message: str = Field(..., description="The message to analyze", min_length=1)
 
 
+# Messages at least this long are counted in an executor
+COUNT_CHARS_OFFLOAD_THRESHOLD = 16 * 1024
+
+
+async def count_characters(
+    message: str, ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """Count the characters in a message.
+
+    Args:
+        message: The message to analyze
+        ctx: The MCP context; None when the call runs in an executor
+
+    Returns:
+        Dictionary result with character counts or error
+    """
+    try:
+        # Validate input parameters
+        params = CountCharsParams(message=message)
+
+        logger.info(f"Count characters tool called with message: {params.message}")
+        if ctx:
+            await ctx.info(f"Analyzing message: {params.message}")
+
+        # Count characters
+        char_count = len(params.message)
+        word_count = len(params.message.split())
+
+        # Calculate other counts
+        analysis_results = {
+            "message": params.message,
+            "character_count": char_count,
+            "word_count": word_count,
+            "uppercase_count": sum(1 for c in params.message if c.isupper()),
+            "lowercase_count": sum(1 for c in params.message if c.islower()),
+            "digit_count": sum(1 for c in params.message if c.isdigit()),
+            "whitespace_count": sum(1 for c in params.message if c.isspace()),
+        }
+
+        # Return the result as a structured object using the helper function
+        return create_success_result(
+            [
+                {"type": "text", "text": "Analysis Results:"},
+                {"type": "json", "json": analysis_results},
+            ]
+        )
+    except ValidationError as e:
+        logger.error(f"Parameter validation error: {e}")
+        return create_error_result(f"Invalid input parameters - {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error in count-chars tool: {e}", exc_info=True)
+        return create_error_result(str(e))
+
+
 # Function to register tools with a server instance
 def register_tools(server):
     """Register all tools with the server.
 
     Args:
-        server: The FastMCP server instance
+        server: The FastMCP server instance or a tool registrar
     """
+    registrar = as_registrar(server)
 
-    # Register tools using server's tool decorator
-    @server.tool(name="echo", description="Echoes back the input message.")
+    # Register tools using the registrar's tool decorator
+    @registrar.tool(name="echo", description="Echoes back the input message.")
     async def echo_message(
         message: str, ctx: Optional[Context] = None
     ) -> Dict[str, Any]:
@@ -64,52 +120,11 @@ def register_tools(server):
             logger.error(f"Unexpected error in echo tool: {e}", exc_info=True)
             return create_error_result(str(e))
 
-    @server.tool(name="count-chars", description="Counts characters in a message.")
-    async def count_characters(
-        message: str, ctx: Optional[Context] = None
-    ) -> Dict[str, Any]:
-        """Count the characters in a message.
-
-        Args:
-            message: The message to analyze
-            ctx: The MCP context
-
-        Returns:
-            Dictionary result with character counts or error
-        """
-        try:
-            # Validate input parameters
-            params = CountCharsParams(message=message)
-
-            logger.info(f"Count characters tool called with message: {params.message}")
-            if ctx:
-                await ctx.info(f"Analyzing message: {params.message}")
-
-            # Count characters
-            char_count = len(params.message)
-            word_count = len(params.message.split())
-
-            # Calculate other counts
-            analysis_results = {
-                "message": params.message,
-                "character_count": char_count,
-                "word_count": word_count,
-                "uppercase_count": sum(1 for c in params.message if c.isupper()),
-                "lowercase_count": sum(1 for c in params.message if c.islower()),
-                "digit_count": sum(1 for c in params.message if c.isdigit()),
-                "whitespace_count": sum(1 for c in params.message if c.isspace()),
-            }
-
-            # Return the result as a structured object using the helper function
-            return create_success_result(
-                [
-                    {"type": "text", "text": "Analysis Results:"},
-                    {"type": "json", "json": analysis_results},
-                ]
-            )
-        except ValidationError as e:
-            logger.error(f"Parameter validation error: {e}")
-            return create_error_result(f"Invalid input parameters - {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error in count-chars tool: {e}", exc_info=True)
-            return create_error_result(str(e))
+    # Defined at module level so it can be sent to a process executor
+    registrar.tool(
+        name="count-chars",
+        description="Counts characters in a message.",
+        coalesce=True,
+        cpu_bound="process",
+        offload_threshold=COUNT_CHARS_OFFLOAD_THRESHOLD,
+    )(count_characters)
@@ -0,0 +1,274 @@
+"""Incremental character counting over appended text."""
+
+import logging
+import secrets
+import time
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from ..sessions import SessionManager, SessionRecord
+from .input_validation import create_error_result, create_success_result
+from .registration import as_registrar
+
+logger = logging.getLogger(__name__)
+
+HANDLE_CACHE_PREFIX = "count-chars:"
+
+
+class CountCharsOpenParams(BaseModel):
+    """Parameters for opening an incremental count handle."""
+
+    message: str = Field(default="", description="Initial text to analyze")
+
+
+class CountCharsAppendParams(BaseModel):
+    """Parameters for appending text to an incremental count handle."""
+
+    handle: str = Field(
+        ..., description="Handle returned by count-chars-open", min_length=1
+    )
+    delta: str = Field(..., description="Text appended to the document", min_length=1)
+
+
+class CountCharsHandleParams(BaseModel):
+    """Parameters identifying an incremental count handle."""
+
+    handle: str = Field(
+        ..., description="Handle returned by count-chars-open", min_length=1
+    )
+
+
+class CharCounter:
+    """Running character statistics for a growing document.
+
+    Only the counts are kept, not the text, so a counter uses constant
+    memory however long the document grows. The counts always equal those
+    the ``count-chars`` tool reports for the full text.
+    """
+
+    __slots__ = (
+        "character_count",
+        "word_count",
+        "uppercase_count",
+        "lowercase_count",
+        "digit_count",
+        "whitespace_count",
+        "in_word",
+        "last_used",
+    )
+
+    def __init__(self, now: float):
+        """Initialize an empty counter.
+
+        Args:
+            now: Current monotonic time
+        """
+        self.character_count = 0
+        self.word_count = 0
+        self.uppercase_count = 0
+        self.lowercase_count = 0
+        self.digit_count = 0
+        self.whitespace_count = 0
+        self.in_word = False
+        self.last_used = now
+
+    def append(self, text: str) -> None:
+        """Update the counts with text appended to the document.
+
+        Args:
+            text: The appended text
+        """
+        if not text:
+            return
+
+        words = len(text.split())
+        if self.in_word and not text[0].isspace():
+            # The first word continues the word the document ended with
+            words -= 1
+
+        self.character_count += len(text)
+        self.word_count += words
+        self.uppercase_count += sum(1 for c in text if c.isupper())
+        self.lowercase_count += sum(1 for c in text if c.islower())
+        self.digit_count += sum(1 for c in text if c.isdigit())
+        self.whitespace_count += sum(1 for c in text if c.isspace())
+        self.in_word = not text[-1].isspace()
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counts in the ``count-chars`` result format.
+
+        Returns:
+            Dictionary of counts
+        """
+        return {
+            "character_count": self.character_count,
+            "word_count": self.word_count,
+            "uppercase_count": self.uppercase_count,
+            "lowercase_count": self.lowercase_count,
+            "digit_count": self.digit_count,
+            "whitespace_count": self.whitespace_count,
+        }
+
+
+def register_incremental_tools(
+    server,
+    sessions: SessionManager,
+    handle_ttl: float = 600.0,
+    clock: Callable[[], float] = time.monotonic,
+):
+    """Register the incremental count-chars tools with the server.
+
+    Handles are stored in the calling session's cache, so they are bounded by
+    the session memory budget and disappear with the session. A handle that
+    has not been used for ``handle_ttl`` seconds is closed. Once the budget
+    is used up, opening another handle fails instead of evicting handles the
+    client may still use.
+
+    Handles are only scoped per client when ``sessions`` is installed on the
+    server; otherwise every caller shares a single local record.
+
+    Args:
+        server: The FastMCP server instance or a tool registrar
+        sessions: Session manager holding the handles
+        handle_ttl: Seconds an unused handle stays open
+        clock: Monotonic clock used to expire handles
+    """
+    registrar = as_registrar(server)
+
+    def analysis_result(handle: str, counter: CharCounter) -> Dict[str, Any]:
+        analysis_results = {"handle": handle, **counter.as_dict()}
+        return create_success_result(
+            [
+                {"type": "text", "text": "Analysis Results:"},
+                {"type": "json", "json": analysis_results},
+            ]
+        )
+
+    def lookup(handle: str, pop: bool = False) -> Optional[CharCounter]:
+        record = sessions.for_request()
+        key = HANDLE_CACHE_PREFIX + handle
+        counter = record.cache_pop(key) if pop else record.cache_get(key)
+        if counter is None:
+            return None
+
+        now = clock()
+        if now - counter.last_used > handle_ttl:
+            record.cache_pop(key)
+            return None
+        counter.last_used = now
+        return counter
+
+    def close_expired(record: SessionRecord) -> None:
+        now = clock()
+        for key in record.cache_keys(HANDLE_CACHE_PREFIX):
+            counter = record.cache_get(key)
+            if counter is not None and now - counter.last_used > handle_ttl:
+                record.cache_pop(key)
+
+    @registrar.tool(
+        name="count-chars-open",
+        description="Opens a handle for counting characters in a growing text.",
+    )
+    async def count_characters_open(message: str = "") -> Dict[str, Any]:
+        """Open an incremental count handle.
+
+        Args:
+            message: Initial text to analyze
+
+        Returns:
+            Dictionary result with the handle and character counts or error
+        """
+        try:
+            params = CountCharsOpenParams(message=message)
+
+            counter = CharCounter(clock())
+            counter.append(params.message)
+
+            handle = secrets.token_hex(8)
+            key = HANDLE_CACHE_PREFIX + handle
+            record = sessions.for_request()
+            if not record.cache_put(key, counter, evict=False):
+                close_expired(record)
+                if not record.cache_put(key, counter, evict=False):
+                    return create_error_result(
+                        "Session memory budget exhausted; close unused handles"
+                    )
+
+            logger.info(f"Opened count-chars handle {handle}")
+            return analysis_result(handle, counter)
+        except ValidationError as e:
+            logger.error(f"Parameter validation error: {e}")
+            return create_error_result(f"Invalid input parameters - {str(e)}")
+        except Exception as e:
+            logger.error(
+                f"Unexpected error in count-chars-open tool: {e}", exc_info=True
+            )
+            return create_error_result(str(e))
+
+    @registrar.tool(
+        name="count-chars-append",
+        description="Appends text to a count-chars handle and returns updated counts.",
+    )
+    async def count_characters_append(handle: str, delta: str) -> Dict[str, Any]:
+        """Append text to an incremental count handle.
+
+        Args:
+            handle: Handle returned by count-chars-open
+            delta: Text appended to the document
+
+        Returns:
+            Dictionary result with the updated character counts or error
+        """
+        try:
+            params = CountCharsAppendParams(handle=handle, delta=delta)
+
+            counter = lookup(params.handle)
+            if counter is None:
+                return create_error_result(
+                    f"Unknown or expired handle: {params.handle}"
+                )
+
+            counter.append(params.delta)
+            return analysis_result(params.handle, counter)
+        except ValidationError as e:
+            logger.error(f"Parameter validation error: {e}")
+            return create_error_result(f"Invalid input parameters - {str(e)}")
+        except Exception as e:
+            logger.error(
+                f"Unexpected error in count-chars-append tool: {e}", exc_info=True
+            )
+            return create_error_result(str(e))
+
+    @registrar.tool(
+        name="count-chars-close",
+        description="Closes a count-chars handle and returns the final counts.",
+    )
+    async def count_characters_close(handle: str) -> Dict[str, Any]:
+        """Close an incremental count handle.
+
+        Args:
+            handle: Handle returned by count-chars-open
+
+        Returns:
+            Dictionary result with the final character counts or error
+        """
+        try:
+            params = CountCharsHandleParams(handle=handle)
+
+            counter = lookup(params.handle, pop=True)
+            if counter is None:
+                return create_error_result(
+                    f"Unknown or expired handle: {params.handle}"
+                )
+
+            logger.info(f"Closed count-chars handle {params.handle}")
+            return analysis_result(params.handle, counter)
+        except ValidationError as e:
+            logger.error(f"Parameter validation error: {e}")
+            return create_error_result(f"Invalid input parameters - {str(e)}")
+        except Exception as e:
+            logger.error(
+                f"Unexpected error in count-chars-close tool: {e}", exc_info=True
+            )
+            return create_error_result(str(e))
@@ -0,0 +1,270 @@
+"""Offloading of CPU-bound tool calls to executors."""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import logging
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import ServerConfig
+from ..profiling import SlowCallProfiler
+from .registration import ToolFunction
+
+logger = logging.getLogger(__name__)
+
+_worker = threading.local()
+
+
+def _run_tool(
+    func: ToolFunction,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    profile: bool = False,
+) -> Tuple[Any, Optional[Dict[Any, Any]]]:
+    """Run an async tool to completion on the worker's own event loop.
+
+    Thread workers get their loop from ``ToolOffloader``, which closes it
+    on shutdown; a process worker creates one on its first call.
+
+    With ``profile`` the call runs under ``cProfile`` in the worker, and its
+    statistics are returned alongside the result.
+    """
+    loop = getattr(_worker, "loop", None)
+    if loop is None:
+        loop = _worker.loop = asyncio.new_event_loop()
+    if not profile:
+        return loop.run_until_complete(func(*args, **kwargs)), None
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is active in this worker
+        return loop.run_until_complete(func(*args, **kwargs)), None
+    try:
+        result = loop.run_until_complete(func(*args, **kwargs))
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+def argument_size(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> int:
+    """Measure the size of a call as the total length of its text arguments.
+
+    Args:
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        Total length of the str, bytes and bytearray arguments
+    """
+    return sum(
+        len(value)
+        for value in (*args, *kwargs.values())
+        if isinstance(value, (str, bytes, bytearray))
+    )
+
+
+class ToolOffloader:
+    """Tool middleware running large CPU-bound calls off the event loop.
+
+    Tools opt in at registration with ``cpu_bound=True`` (thread executor)
+    or ``cpu_bound="process"`` and an ``offload_threshold``. A call whose
+    text arguments total at least the threshold runs in the executor;
+    smaller calls run inline, where they finish faster than a dispatch
+    would take. The whole tool coroutine runs on an event loop owned by the
+    worker, so offloaded tools must not await objects tied to the server's
+    loop; for that reason an offloaded call receives ``ctx=None`` instead of
+    the MCP context.
+
+    Thread workers keep the loop responsive but still share the GIL.
+    Process workers run in parallel; they need the tool function and its
+    arguments to be picklable, and fall back to threads otherwise or when
+    no process workers are configured. A tool that would fall back to
+    threads runs inline when there are no thread workers. Process workers are started with
+    the ``forkserver`` method where available and ``spawn`` otherwise, so
+    they never inherit the server's threads or event loop. Executors are
+    created on first use. ``shutdown`` closes the event loops of the thread
+    workers; a process worker's loop ends with its process.
+
+    With a profiler, an offloaded call that is being profiled is profiled
+    inside the worker rather than on the event loop.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int = 4,
+        process_workers: int = 0,
+        profiler: Optional[SlowCallProfiler] = None,
+    ):
+        """Initialize the offloader.
+
+        Args:
+            thread_workers: Size of the thread executor; 0 runs inline every
+                call that is not sent to a process
+            process_workers: Size of the process executor; 0 disables it
+            profiler: Optional slow-call profiler wrapping the offloaded tools
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.profiler = profiler
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._worker_loops: List[asyncio.AbstractEventLoop] = []
+        self._worker_loops_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_config(
+        cls, config: ServerConfig, profiler: Optional[SlowCallProfiler] = None
+    ) -> "ToolOffloader":
+        """Create an offloader from the server configuration.
+
+        Args:
+            config: Server configuration
+            profiler: Optional slow-call profiler wrapping the offloaded tools
+
+        Returns:
+            A configured offloader
+        """
+        return cls(
+            thread_workers=config.offload_thread_workers,
+            process_workers=config.offload_process_workers,
+            profiler=profiler,
+        )
+
+    def wrap_tool(
+        self, name: str, func: ToolFunction, options: Dict[str, Any]
+    ) -> ToolFunction:
+        """Wrap a CPU-bound tool so large calls run in an executor.
+
+        Args:
+            name: Name of the tool
+            func: The async tool function
+            options: Tool registration options; ``cpu_bound`` and
+                ``offload_threshold`` enable offloading
+
+        Returns:
+            The wrapped tool function, or ``func`` if the tool is not CPU-bound
+        """
+        cpu_bound = options.get("cpu_bound")
+        if not cpu_bound:
+            return func
+
+        use_process = cpu_bound == "process" and self.process_workers > 0
+        if use_process:
+            try:
+                pickle.dumps(func)
+            except Exception:
+                logger.warning(
+                    f"Tool {name} cannot be sent to a process; offloading to threads"
+                )
+                use_process = False
+        if not use_process and self.thread_workers <= 0:
+            return func
+
+        threshold = options.get("offload_threshold", 0)
+
+        stats: Dict[str, Any] = self._stats.setdefault(
+            name,
+            {
+                "inline": 0,
+                "offloaded": 0,
+                "threshold": threshold,
+                "executor": "process" if use_process else "thread",
+            },
+        )
+
+        @functools.wraps(func)
+        async def offloaded_tool(*args: Any, **kwargs: Any) -> Any:
+            if argument_size(args, kwargs) < threshold:
+                stats["inline"] += 1
+                return await func(*args, **kwargs)
+
+            stats["offloaded"] += 1
+            if "ctx" in kwargs:
+                # The context is bound to the server's loop and connection
+                kwargs = {**kwargs, "ctx": None}
+            profile = self.profiler is not None and self.profiler.offload_capture()
+
+            loop = asyncio.get_running_loop()
+            if use_process:
+                call = functools.partial(_run_tool, func, args, kwargs, profile)
+                executor = self._processes()
+            else:
+                context = contextvars.copy_context()
+                call = functools.partial(
+                    context.run, _run_tool, func, args, kwargs, profile
+                )
+                executor = self._threads()
+            result, profile_stats = await loop.run_in_executor(executor, call)
+
+            if profile_stats is not None and self.profiler is not None:
+                self.profiler.attach_offloaded_stats(profile_stats)
+            return result
+
+        return offloaded_tool
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize offloading per tool.
+
+        Returns:
+            Dictionary with executor sizes and per-tool inline and offloaded
+            call counts
+        """
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            "tools": {name: dict(counts) for name, counts in self._stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the executors, waiting for running calls.
+
+        The event loops of the thread workers are closed once their threads
+        have exited.
+        """
+        executors = (self._thread_executor, self._process_executor)
+        self._thread_executor = self._process_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        with self._worker_loops_lock:
+            loops, self._worker_loops = self._worker_loops, []
+        for loop in loops:
+            loop.close()
+
+    def _threads(self) -> Executor:
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self.thread_workers,
+                thread_name_prefix="tool-offload",
+                initializer=self._start_thread_worker,
+            )
+        return self._thread_executor
+
+    def _start_thread_worker(self) -> None:
+        """Create the worker thread's event loop and register it for closing."""
+        loop = _worker.loop = asyncio.new_event_loop()
+        with self._worker_loops_lock:
+            self._worker_loops.append(loop)
+
+    def _processes(self) -> Executor:
+        if self._process_executor is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context(start_method),
+            )
+        return self._process_executor
@@ -0,0 +1,97 @@
+"""Runtime control of the slow-call profiler."""
+
+import logging
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from ..profiling import SlowCallProfiler
+from .input_validation import create_error_result, create_success_result
+from .registration import as_registrar
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigureProfilingParams(BaseModel):
+    """Parameters for changing the profiler settings."""
+
+    threshold_ms: Optional[float] = Field(
+        default=None, ge=0, description="New latency threshold in milliseconds"
+    )
+    clear_threshold: bool = Field(
+        default=False, description="Stop capturing calls by latency"
+    )
+    sample_rate: Optional[float] = Field(
+        default=None, ge=0.0, le=1.0, description="New fraction of calls to profile"
+    )
+
+
+def register_profiling_tools(server, profiler: SlowCallProfiler):
+    """Register the tool that changes profiler settings at runtime.
+
+    Any connected client can call it, so it is only registered when
+    ``profile_control`` is enabled in the server configuration.
+
+    Args:
+        server: The FastMCP server instance or a tool registrar
+        profiler: The profiler to control
+    """
+    registrar = as_registrar(server)
+
+    @registrar.tool(
+        name="configure-profiling",
+        description="Changes the slow-call profiler threshold and sample rate.",
+    )
+    async def configure_profiling(
+        threshold_ms: Optional[float] = None,
+        clear_threshold: bool = False,
+        sample_rate: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Change the profiler settings; omitted values stay as they are.
+
+        Args:
+            threshold_ms: New latency threshold in milliseconds
+            clear_threshold: Stop capturing calls by latency
+            sample_rate: New fraction of calls to profile regardless of latency
+
+        Returns:
+            Dictionary result with the settings now in effect or error
+        """
+        try:
+            params = ConfigureProfilingParams(
+                threshold_ms=threshold_ms,
+                clear_threshold=clear_threshold,
+                sample_rate=sample_rate,
+            )
+            if params.clear_threshold and params.threshold_ms is not None:
+                return create_error_result(
+                    "threshold_ms and clear_threshold are mutually exclusive"
+                )
+
+            if params.clear_threshold:
+                profiler.set_threshold(None)
+            elif params.threshold_ms is not None:
+                profiler.set_threshold(params.threshold_ms)
+            if params.sample_rate is not None:
+                profiler.set_sample_rate(params.sample_rate)
+
+            settings = {
+                "enabled": profiler.enabled,
+                "threshold_ms": profiler.threshold_ms,
+                "sample_rate": profiler.sample_rate,
+            }
+            logger.info(f"Profiler settings changed: {settings}")
+            return create_success_result(
+                [
+                    {"type": "text", "text": "Profiler settings:"},
+                    {"type": "json", "json": settings},
+                ]
+            )
+        except ValidationError as e:
+            logger.error(f"Parameter validation error: {e}")
+            return create_error_result(f"Invalid input parameters - {str(e)}")
+        except Exception as e:
+            logger.error(
+                f"Unexpected error in configure-profiling tool: {e}", exc_info=True
+            )
+            return create_error_result(str(e))
@@ -0,0 +1,88 @@
+"""Tool registration layer shared by all tool modules."""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence
+
+logger = logging.getLogger(__name__)
+
+ToolFunction = Callable[..., Awaitable[Dict[str, Any]]]
+
+
+class ToolMiddleware(Protocol):
+    """Interface for objects that wrap tool bodies at registration time."""
+
+    def wrap_tool(
+        self, name: str, func: ToolFunction, options: Dict[str, Any]
+    ) -> ToolFunction:
+        """Wrap a tool function.
+
+        Args:
+            name: Name the tool is registered under
+            func: The tool function (possibly already wrapped)
+            options: Extra registration options declared by the tool
+
+        Returns:
+            The wrapped tool function
+        """
+        ...
+
+
+class ToolRegistrar:
+    """Registers tools with a server, applying middleware to every tool.
+
+    The registrar exposes the same ``tool(name=..., description=...)``
+    decorator as the server, so tool modules can register against either.
+    Extra keyword options are passed to the middleware and never reach the
+    underlying server.
+    """
+
+    def __init__(self, server, middleware: Optional[Sequence[ToolMiddleware]] = None):
+        """Initialize the registrar.
+
+        Args:
+            server: The FastMCP server instance (or any object with a
+                compatible ``tool`` decorator)
+            middleware: Middleware applied to each tool, outermost first
+        """
+        self.server = server
+        self.middleware: List[ToolMiddleware] = list(middleware or [])
+
+    def tool(
+        self, name: str, description: str, **options: Any
+    ) -> Callable[[ToolFunction], ToolFunction]:
+        """Decorator registering a tool with middleware applied.
+
+        Args:
+            name: Name of the tool
+            description: Description of the tool
+            **options: Extra options interpreted by the middleware
+
+        Returns:
+            A decorator that registers the wrapped function
+        """
+
+        def decorator(func: ToolFunction) -> ToolFunction:
+            wrapped = func
+            for middleware in reversed(self.middleware):
+                wrapped = middleware.wrap_tool(name, wrapped, options)
+            self.server.tool(name=name, description=description)(wrapped)
+            logger.debug(
+                f"Registered tool {name} with {len(self.middleware)} middleware"
+            )
+            return wrapped
+
+        return decorator
+
+
+def as_registrar(server) -> ToolRegistrar:
+    """Return ``server`` as a registrar, wrapping plain servers.
+
+    Args:
+        server: A server instance or an existing registrar
+
+    Returns:
+        A registrar for the server
+    """
+    if isinstance(server, ToolRegistrar):
+        return server
+    return ToolRegistrar(server)
@@ -0,0 +1,46 @@
+"""Shared fixtures for tests."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from template_mcp.config import ServerConfig
+from template_mcp.server import TemplateMCPServer
+
+
+@pytest.fixture
+def template_server(tmp_path):
+    """Create a fully configured server whose profiles go to a temp dir."""
+    return TemplateMCPServer(ServerConfig(profile_dir=str(tmp_path / "profiles")))
+
+
+@pytest_asyncio.fixture
+async def mcp_client(template_server):
+    """Connect a client session to the server through the memory transport.
+
+    The connection is hosted in its own task because the transport's task
+    group must be entered and exited by the same task, while fixture setup
+    and teardown may run in different ones.
+    """
+    connected = asyncio.Event()
+    finished = asyncio.Event()
+    sessions = []
+
+    async def hold_connection():
+        async with template_server.connect(raise_exceptions=True) as session:
+            sessions.append(session)
+            connected.set()
+            await finished.wait()
+
+    task = asyncio.create_task(hold_connection())
+    waiter = asyncio.create_task(connected.wait())
+    await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    if task.done():
+        waiter.cancel()
+        task.result()
+
+    yield sessions[0]
+
+    finished.set()
+    await task
@@ -0,0 +1,163 @@
+"""Tests for the pooled client library."""
+
+import asyncio
+import json
+
+import anyio
+import pytest
+
+from template_mcp.client import TemplateMCPClient, is_transient_error
+from template_mcp.memory_transport import memory_client_transport
+
+
+@pytest.mark.asyncio
+async def test_call_many_returns_results_in_order(template_server):
+    """Test that pipelined calls return results in request order."""
+    messages = [f"message number {i}" for i in range(40)]
+
+    async with TemplateMCPClient.in_memory(
+        template_server.server, pool_size=2, max_in_flight=4
+    ) as client:
+        results = await client.call_many(
+            ("count-chars", {"message": message}) for message in messages
+        )
+        stats = client.stats()
+
+    counts = [json.loads(r.content[0].text)["content"][1]["json"] for r in results]
+    assert [c["message"] for c in counts] == messages
+    assert stats["count-chars"]["calls"] == 40
+    assert stats["count-chars"]["errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_on_fresh_session(template_server):
+    """Test that transport errors retry on a replacement session."""
+    failures = []
+
+    async def flaky(session):
+        if not failures:
+            failures.append(session)
+            raise anyio.ClosedResourceError()
+        return await session.list_tools()
+
+    async with TemplateMCPClient.in_memory(
+        template_server.server, pool_size=1, backoff_base=0.0
+    ) as client:
+        result = await client.run("flaky", flaky)
+        stats = client.stats()["flaky"]
+        retried_session = client._pool[0].session
+
+    assert result.tools
+    assert stats["retries"] == 1
+    assert retried_session is not failures[0]
+
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_are_not_retried(template_server):
+    """Test that application errors are raised without retrying."""
+    attempts = []
+
+    async def failing(session):
+        attempts.append(session)
+        raise ValueError("bad request")
+
+    async with TemplateMCPClient.in_memory(template_server.server) as client:
+        with pytest.raises(ValueError):
+            await client.run("failing", failing)
+        stats = client.stats()["failing"]
+
+    assert len(attempts) == 1
+    assert stats["errors"] == 1
+
+
+def test_is_transient_error():
+    """Test transport error classification."""
+    assert is_transient_error(anyio.BrokenResourceError())
+    assert is_transient_error(ConnectionResetError())
+    assert not is_transient_error(ValueError("bad request"))
+
+
+@pytest.mark.asyncio
+async def test_in_flight_calls_are_bounded(template_server):
+    """Test that a session never has more than max_in_flight calls."""
+    active = []
+    peak = []
+
+    async def slow(session):
+        active.append(session)
+        peak.append(len(active))
+        await anyio.sleep(0.01)
+        active.remove(session)
+        return True
+
+    async with TemplateMCPClient.in_memory(
+        template_server.server, pool_size=1, max_in_flight=3
+    ) as client:
+        results = await asyncio.gather(*(client.run("slow", slow) for _ in range(10)))
+
+    assert all(results)
+    assert max(peak) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_refill_does_not_block_healthy_sessions(template_server):
+    """Test that a pool short of sessions refills in the background."""
+    connects = []
+
+    def transport():
+        connects.append(None)
+        if len(connects) > 2:
+            raise ConnectionRefusedError("server unavailable")
+        return memory_client_transport(template_server.server)
+
+    async with TemplateMCPClient(transport, pool_size=2) as client:
+        # A fixed delay keeps the refill to one attempt during the calls
+        client._backoff = lambda attempt: 1.0
+        client._pool[0].broken = True
+        start = asyncio.get_running_loop().time()
+        results = await asyncio.gather(
+            *(client.call_tool("echo", {"message": str(i)}) for i in range(10))
+        )
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert len(results) == 10
+        assert len(client._pool) == 1
+        assert elapsed < 0.5
+        # One background refill attempt, not one per call
+        assert len(connects) == 3
+
+
+@pytest.mark.asyncio
+async def test_pinned_session_keeps_handles_and_never_retries(template_server):
+    """Test that stateful calls stay on one session while others run."""
+
+    def counts(result):
+        return json.loads(result.content[0].text)["content"][1]["json"]
+
+    async with TemplateMCPClient.in_memory(
+        template_server.server, pool_size=2
+    ) as client:
+        other = asyncio.ensure_future(
+            client.call_many(("echo", {"message": str(i)}) for i in range(20))
+        )
+        async with client.session() as session:
+            opened = await session.call_tool("count-chars-open", {"message": "a"})
+            handle = counts(opened)["handle"]
+            for _ in range(20):
+                appended = await session.call_tool(
+                    "count-chars-append", {"handle": handle, "delta": "b"}
+                )
+                assert not appended.isError
+            closed = await session.call_tool("count-chars-close", {"handle": handle})
+
+            async def broken(session):
+                raise anyio.ClosedResourceError()
+
+            with pytest.raises(anyio.ClosedResourceError):
+                await session.run("broken", broken)
+        await other
+        stats = client.stats()
+
+    assert counts(closed)["character_count"] == 21
+    assert stats["broken"]["calls"] == 1
+    assert stats["broken"]["retries"] == 0
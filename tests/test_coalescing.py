@@ -0,0 +1,162 @@
+"""Tests for single-flight coalescing of tool calls."""
+
+import asyncio
+import json
+from typing import Optional
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from template_mcp.tools import example_tool
+from template_mcp.tools.coalescing import CallCoalescer
+
+
+class SlowTool:
+    """Tool body that blocks until released and counts its executions."""
+
+    def __init__(self):
+        """Initialize the tool."""
+        self.executions = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, message: str, repeat: int = 1):
+        """Run the tool."""
+        self.executions += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"content": [{"type": "text", "text": message * repeat}]}
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_execution():
+    """Test that equal validated arguments share an execution."""
+    coalescer = CallCoalescer()
+    body = SlowTool()
+    tool = coalescer.wrap_tool("slow", body, {"coalesce": True})
+
+    calls = [
+        asyncio.ensure_future(tool("a")),
+        asyncio.ensure_future(tool("a", repeat=1)),
+        asyncio.ensure_future(tool(message="a")),
+        asyncio.ensure_future(tool("b")),
+    ]
+    await asyncio.sleep(0)
+    body.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert body.executions == 2
+    assert [r["content"][0]["text"] for r in results] == ["a", "a", "a", "b"]
+    assert coalescer.stats()["tools"]["slow"] == {
+        "calls": 4,
+        "executions": 2,
+        "coalesced": 2,
+    }
+
+    # Nothing is cached once the execution has finished
+    await tool("a")
+    assert body.executions == 3
+
+
+@pytest.mark.asyncio
+async def test_execution_is_cancelled_only_when_every_waiter_has_gone():
+    """Test that cancelling one waiter leaves the shared execution running."""
+    coalescer = CallCoalescer()
+    body = SlowTool()
+    tool = coalescer.wrap_tool("slow", body, {"coalesce": True})
+
+    first = asyncio.ensure_future(tool("a"))
+    second = asyncio.ensure_future(tool("a"))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert body.cancelled == 0
+
+    second.cancel()
+    await asyncio.gather(first, second, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert body.cancelled == 1
+    assert coalescer.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_large_arguments_are_keyed_by_digest():
+    """Test that in-flight keys stay small however large the input is."""
+    coalescer = CallCoalescer()
+    body = SlowTool()
+    tool = coalescer.wrap_tool("slow", body, {"coalesce": True})
+    message = "x" * (4 * 1024 * 1024)
+
+    calls = [
+        asyncio.ensure_future(tool(message)),
+        asyncio.ensure_future(tool("x" * (4 * 1024 * 1024))),
+        asyncio.ensure_future(tool(message + "y")),
+    ]
+    await asyncio.sleep(0)
+
+    assert len(coalescer._in_flight) == 2
+    assert all(len(key[1]) == 32 for key in coalescer._in_flight)
+    body.release.set()
+    await asyncio.gather(*calls)
+    assert body.executions == 2
+
+
+@pytest.mark.asyncio
+async def test_tools_without_opt_in_are_not_wrapped():
+    """Test that only tools registered with coalesce=True are coalesced."""
+    coalescer = CallCoalescer()
+    body = SlowTool()
+
+    assert coalescer.wrap_tool("slow", body, {}) is body
+
+
+@pytest.fixture
+def gated_count_chars(monkeypatch):
+    """Hold count-chars executions until released, counting them."""
+    gate = SlowTool()
+    count_characters = example_tool.count_characters
+
+    async def gated(message: str, ctx: Optional[Context] = None):
+        await gate(message)
+        return await count_characters(message, ctx)
+
+    monkeypatch.setattr(example_tool, "count_characters", gated)
+    return gate
+
+
+@pytest.mark.asyncio
+async def test_count_chars_calls_are_coalesced(
+    gated_count_chars, template_server, mcp_client
+):
+    """Test that concurrent count-chars requests are coalesced end to end."""
+    message = "shared document " * 100
+    calls = [
+        asyncio.ensure_future(mcp_client.call_tool("count-chars", {"message": message}))
+        for _ in range(5)
+    ]
+    # Release the execution only once every request has joined it
+    for _ in range(100):
+        if template_server.coalescer.stats()["calls"] == 5:
+            break
+        await asyncio.sleep(0.01)
+    gated_count_chars.release.set()
+    results = await asyncio.gather(*calls)
+
+    counts = {
+        json.loads(r.content[0].text)["content"][1]["json"]["character_count"]
+        for r in results
+    }
+    assert counts == {len(message)}
+    assert gated_count_chars.executions == 1
+
+    report = await mcp_client.read_resource("resource://coalescing-stats")
+    stats = json.loads(report.contents[0].text)
+    assert stats["tools"]["count-chars"] == {
+        "calls": 5,
+        "executions": 1,
+        "coalesced": 4,
+    }
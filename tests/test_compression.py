@@ -0,0 +1,130 @@
+"""Tests for negotiated response compression on the SSE transport."""
+
+import asyncio
+import json
+import zlib
+
+import httpx
+import pytest
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from template_mcp.compression import CompressionMiddleware, negotiate_encoding
+from template_mcp.config import ServerConfig
+from template_mcp.server import TemplateMCPServer
+from template_mcp.sse_transport import create_sse_app
+
+
+def test_negotiate_encoding():
+    """Test that the client's quality values and server preference decide."""
+    offered = ["zstd", "gzip", "deflate"]
+
+    assert negotiate_encoding("gzip, deflate", offered) == "gzip"
+    assert negotiate_encoding("deflate, gzip;q=0.5", offered) == "deflate"
+    assert negotiate_encoding("zstd, gzip", offered) == "zstd"
+    assert negotiate_encoding("gzip;q=0, *;q=0.1", offered) == "zstd"
+    assert negotiate_encoding("br", offered) is None
+    assert negotiate_encoding("", offered) is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_compresses_only_large_responses():
+    """Test that only bodies at or above the threshold are compressed."""
+    payload = {"counts": list(range(500))}
+
+    async def large(request):
+        return JSONResponse(payload)
+
+    async def small(request):
+        return PlainTextResponse("Accepted")
+
+    app = CompressionMiddleware(
+        Starlette(routes=[Route("/large", large), Route("/small", small)]),
+        minimum_size=1024,
+        encodings=["gzip", "deflate"],
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(json.dumps(payload))
+        assert response.json() == payload
+
+        response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == "Accepted"
+
+        response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_are_decodable_as_they_arrive():
+    """Test that each streamed chunk can be decoded without later output."""
+    events = [f"event: message\ndata: {i}\n\n".encode() * 20 for i in range(3)]
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for event in events:
+            await send({"type": "http.response.body", "body": event, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"deflate")]}
+    # The size threshold cannot apply to a stream of unknown length
+    middleware = CompressionMiddleware(app, minimum_size=1 << 20, encodings=["deflate"])
+    await middleware(scope, None, send)
+
+    assert (b"content-encoding", b"deflate") in sent[0]["headers"]
+    decompressor = zlib.decompressobj()
+    for event, message in zip(events, sent[1:]):
+        assert len(message["body"]) < len(event)
+        assert decompressor.decompress(message["body"]) == event
+    decompressor.decompress(sent[-1]["body"])
+    assert decompressor.eof
+
+
+@pytest.mark.asyncio
+async def test_sse_transport_round_trip_with_compression(tmp_path):
+    """Test that a client can use the server over compressed SSE."""
+    template_server = TemplateMCPServer(
+        ServerConfig(profile_dir=str(tmp_path), compression_min_size=256)
+    )
+    app = create_sse_app(template_server.server, template_server.config)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/sse"
+
+        async with httpx.AsyncClient() as client:
+            async with client.stream(
+                "GET", url, headers={"Accept-Encoding": "gzip"}
+            ) as response:
+                assert response.headers["content-encoding"] == "gzip"
+                first_chunk = await response.aiter_text().__anext__()
+                assert first_chunk.startswith("event: endpoint")
+
+        message = "Hello, compressed world! " * 200
+        async with sse_client(url) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                result = await session.call_tool("count-chars", {"message": message})
+
+        analysis = json.loads(result.content[0].text)
+        assert analysis["content"][1]["json"]["character_count"] == len(message)
+    finally:
+        server.should_exit = True
+        await serving
@@ -0,0 +1,185 @@
+"""Tests for offloading CPU-bound tools and the event-loop lag monitor."""
+
+import asyncio
+import json
+import pstats
+import threading
+import time
+
+import pytest
+
+from template_mcp.loop_monitor import EventLoopLagMonitor
+from template_mcp.profiling import SlowCallProfiler
+from template_mcp.tools.example_tool import (
+    COUNT_CHARS_OFFLOAD_THRESHOLD,
+    count_characters,
+)
+from template_mcp.tools.offload import ToolOffloader
+
+
+async def thread_name_tool(message: str):
+    """Tool body reporting the thread it ran on."""
+    return {"thread": threading.current_thread().name, "length": len(message)}
+
+
+@pytest.mark.asyncio
+async def test_only_calls_above_threshold_are_offloaded():
+    """Test that small calls run inline and large ones in the executor."""
+    offloader = ToolOffloader(thread_workers=2)
+    tool = offloader.wrap_tool(
+        "sample", thread_name_tool, {"cpu_bound": True, "offload_threshold": 100}
+    )
+
+    try:
+        small = await tool("x" * 10)
+        large = await tool(message="x" * 100)
+    finally:
+        offloader.shutdown()
+
+    assert small["thread"] == threading.current_thread().name
+    assert large["thread"].startswith("tool-offload")
+    assert offloader.stats()["tools"]["sample"]["inline"] == 1
+    assert offloader.stats()["tools"]["sample"]["offloaded"] == 1
+
+
+async def context_tool(message: str, ctx=None):
+    """Tool body reporting the context it received."""
+    return {"ctx": ctx}
+
+
+@pytest.mark.asyncio
+async def test_offloaded_calls_do_not_receive_the_context():
+    """Test that the loop-bound context is not sent to the executor."""
+    offloader = ToolOffloader(thread_workers=1)
+    tool = offloader.wrap_tool(
+        "context", context_tool, {"cpu_bound": True, "offload_threshold": 10}
+    )
+    ctx = object()
+
+    try:
+        inline = await tool("x", ctx=ctx)
+        offloaded = await tool("x" * 10, ctx=ctx)
+    finally:
+        offloader.shutdown()
+
+    assert inline["ctx"] is ctx
+    assert offloaded["ctx"] is None
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_module_level_tools():
+    """Test that picklable tools run in processes and closures fall back."""
+    offloader = ToolOffloader(thread_workers=1, process_workers=1)
+    options = {"cpu_bound": "process", "offload_threshold": 10}
+    tool = offloader.wrap_tool("count-chars", count_characters, options)
+
+    async def closure_tool(message: str):
+        return {"length": len(message)}
+
+    fallback = offloader.wrap_tool("closure", closure_tool, options)
+
+    try:
+        result = await tool("Hello, offloaded world!")
+        assert (await fallback("x" * 20))["length"] == 20
+    finally:
+        offloader.shutdown()
+
+    assert result["content"][1]["json"]["character_count"] == 23
+    stats = offloader.stats()["tools"]
+    assert stats["count-chars"]["executor"] == "process"
+    assert stats["closure"]["executor"] == "thread"
+
+
+@pytest.mark.asyncio
+async def test_process_offloading_does_not_need_thread_workers():
+    """Test that process workers are used even without thread workers."""
+    offloader = ToolOffloader(thread_workers=0, process_workers=1)
+    options = {"cpu_bound": "process", "offload_threshold": 0}
+    tool = offloader.wrap_tool("count-chars", count_characters, options)
+    inline = offloader.wrap_tool("sample", thread_name_tool, {"cpu_bound": True})
+
+    try:
+        result = await tool("Hello, offloaded world!")
+        assert (await inline("x"))["thread"] == threading.current_thread().name
+    finally:
+        offloader.shutdown()
+
+    assert result["content"][1]["json"]["character_count"] == 23
+    assert offloader.stats()["tools"]["count-chars"]["offloaded"] == 1
+    assert "sample" not in offloader.stats()["tools"]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_worker_loops():
+    """Test that the event loops of the thread workers are closed."""
+    offloader = ToolOffloader(thread_workers=2)
+    tool = offloader.wrap_tool("sample", thread_name_tool, {"cpu_bound": True})
+
+    await asyncio.gather(*(tool("x") for _ in range(4)))
+    loops = list(offloader._worker_loops)
+    offloader.shutdown()
+
+    assert loops
+    assert all(loop.is_closed() for loop in loops)
+    assert not offloader._worker_loops
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("process_workers", [0, 1])
+async def test_offloaded_calls_are_profiled_in_the_worker(tmp_path, process_workers):
+    """Test that profiles of offloaded calls contain the tool body."""
+    profiler = SlowCallProfiler(directory=str(tmp_path), threshold_ms=0)
+    offloader = ToolOffloader(
+        thread_workers=1, process_workers=process_workers, profiler=profiler
+    )
+    options = {"cpu_bound": "process", "offload_threshold": 0}
+    tool = profiler.wrap_tool(
+        "count-chars",
+        offloader.wrap_tool("count-chars", count_characters, options),
+        options,
+    )
+
+    try:
+        await tool("Hello, profiled world!")
+    finally:
+        offloader.shutdown()
+
+    [capture] = profiler.list_profiles()
+    functions = {
+        function for _, _, function in pstats.Stats(capture["profile_path"]).stats
+    }
+    assert capture["offloaded"] is True
+    assert "count_characters" in functions
+
+
+@pytest.mark.asyncio
+async def test_lag_monitor_reports_blocking():
+    """Test that blocking the loop is recorded as a stall."""
+    monitor = EventLoopLagMonitor(interval=0.01, threshold_ms=30)
+
+    async with monitor.running():
+        await asyncio.sleep(0.02)
+        time.sleep(0.06)
+        await asyncio.sleep(0.03)
+
+    stats = monitor.stats()
+    assert stats["running"] is False
+    assert stats["stalls"] >= 1
+    assert stats["max_lag_ms"] >= 30
+
+
+@pytest.mark.asyncio
+async def test_large_count_chars_is_offloaded(mcp_client):
+    """Test that the server offloads large count-chars calls."""
+    message = "abc " * (COUNT_CHARS_OFFLOAD_THRESHOLD // 4)
+    result = await mcp_client.call_tool("count-chars", {"message": message})
+    await mcp_client.call_tool("count-chars", {"message": "small"})
+
+    counts = json.loads(result.content[0].text)["content"][1]["json"]
+    assert counts["character_count"] == len(message)
+
+    report = await mcp_client.read_resource("resource://event-loop-stats")
+    stats = json.loads(report.contents[0].text)
+    assert stats["lag"]["running"] is True
+    assert stats["offload"]["tools"]["count-chars"]["offloaded"] == 1
+    assert stats["offload"]["tools"]["count-chars"]["inline"] == 1
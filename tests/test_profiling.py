@@ -0,0 +1,168 @@
+"""Tests for the slow-call profiler."""
+
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from template_mcp.profiling import SlowCallProfiler
+from template_mcp.resources import get_resources
+from template_mcp.config import ServerConfig
+from template_mcp.server import TemplateMCPServer
+
+
+async def sample_tool(message: str):
+    """Tool body used for profiling tests."""
+    return {"content": [{"type": "text", "text": message}]}
+
+
+async def sample_reader(path=None):
+    """Resource reader used for profiling tests."""
+    yield {"content_type": "text/plain"}, b"first"
+    yield {"content_type": "text/plain"}, b"second"
+
+
+@pytest.mark.asyncio
+async def test_idle_profiler_writes_nothing(tmp_path):
+    """Test that a profiler without threshold or sampling captures nothing."""
+    profiler = SlowCallProfiler(directory=str(tmp_path))
+    tool = profiler.wrap_tool("sample", sample_tool, {})
+
+    result = await tool("hello")
+
+    assert result["content"][0]["text"] == "hello"
+    assert profiler.enabled is False
+    assert profiler.list_profiles() == []
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_captured(tmp_path):
+    """Test that calls over the threshold produce profile files."""
+    profiler = SlowCallProfiler(
+        directory=str(tmp_path), threshold_ms=0, capture_allocations=True
+    )
+    tool = profiler.wrap_tool("sample", sample_tool, {})
+
+    await tool("hello")
+
+    profiles = profiler.list_profiles()
+    assert len(profiles) == 1
+    assert profiles[0]["kind"] == "tool"
+    assert profiles[0]["name"] == "sample"
+    assert os.path.exists(profiles[0]["profile_path"])
+    assert os.path.exists(profiles[0]["allocations_path"])
+
+
+@pytest.mark.asyncio
+async def test_fast_call_below_threshold_is_discarded(tmp_path):
+    """Test that calls under the threshold are not kept."""
+    profiler = SlowCallProfiler(directory=str(tmp_path), threshold_ms=60_000)
+    tool = profiler.wrap_tool("sample", sample_tool, {})
+
+    await tool("hello")
+
+    assert profiler.list_profiles() == []
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_fast_call_takes_no_allocation_snapshot(tmp_path, monkeypatch):
+    """Test that discarded calls skip the tracemalloc snapshot."""
+    snapshots = []
+    take_snapshot = tracemalloc.take_snapshot
+
+    def counting_snapshot():
+        snapshots.append(None)
+        return take_snapshot()
+
+    monkeypatch.setattr(tracemalloc, "take_snapshot", counting_snapshot)
+    profiler = SlowCallProfiler(
+        directory=str(tmp_path), threshold_ms=60_000, capture_allocations=True
+    )
+    tool = profiler.wrap_tool("sample", sample_tool, {})
+
+    await tool("hello")
+    assert snapshots == []
+
+    profiler.set_threshold(0)
+    await tool("hello")
+    assert len(snapshots) == 1
+
+
+def test_settings_are_validated(tmp_path):
+    """Test that invalid thresholds and sample rates are rejected."""
+    profiler = SlowCallProfiler(directory=str(tmp_path))
+
+    with pytest.raises(ValueError):
+        profiler.set_threshold(-1)
+    with pytest.raises(ValueError):
+        profiler.set_sample_rate(1.5)
+
+    profiler.set_sample_rate(0.5)
+    assert profiler.enabled is True
+    profiler.set_sample_rate(0.0)
+    assert profiler.enabled is False
+
+
+@pytest.mark.asyncio
+async def test_configure_profiling_tool_changes_settings(tmp_path):
+    """Test that operators can turn profiling on and off at runtime."""
+    config = ServerConfig(profile_dir=str(tmp_path), profile_control=True)
+    server = TemplateMCPServer(config)
+
+    async with server.connect() as session:
+        result = await session.call_tool("configure-profiling", {"threshold_ms": 0})
+        await session.call_tool("echo", {"message": "profiled"})
+        invalid = await session.call_tool("configure-profiling", {"sample_rate": 2})
+        await session.call_tool("configure-profiling", {"clear_threshold": True})
+
+    settings = json.loads(result.content[0].text)["content"][1]["json"]
+    assert settings == {"enabled": True, "threshold_ms": 0.0, "sample_rate": 0.0}
+    assert "Invalid input parameters" in invalid.content[0].text
+    assert server.profiler.enabled is False
+    assert any(p["name"] == "echo" for p in server.profiler.list_profiles())
+
+
+def test_configure_profiling_tool_is_opt_in(template_server):
+    """Test that the control tool is not registered by default."""
+    tools = template_server.server._tool_manager.list_tools()
+    assert "configure-profiling" not in {tool.name for tool in tools}
+
+
+@pytest.mark.asyncio
+async def test_profile_ring_is_bounded(tmp_path):
+    """Test that the oldest captures are deleted beyond max_files."""
+    profiler = SlowCallProfiler(directory=str(tmp_path), sample_rate=1.0, max_files=2)
+    reader = profiler.wrap_reader("sample", sample_reader)
+
+    for _ in range(4):
+        chunks = [content async for _, content in reader()]
+        assert chunks == [b"first", b"second"]
+
+    profiles = profiler.list_profiles()
+    assert [entry["sequence"] for entry in profiles] == [3, 4]
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(entry["profile_path"]) for entry in profiles
+    )
+
+    # A new profiler adopts the existing ring
+    reloaded = SlowCallProfiler(directory=str(tmp_path), max_files=2)
+    assert [entry["sequence"] for entry in reloaded.list_profiles()] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_profiles_resource_lists_captures(tmp_path):
+    """Test that the profiles resource lists captured profiles."""
+    profiler = SlowCallProfiler(directory=str(tmp_path), threshold_ms=0)
+    await profiler.wrap_tool("sample", sample_tool, {})("hello")
+
+    resources = get_resources(ServerConfig(), profiler)
+    definition = next(r for r in resources if r["name"] == "slow-call-profiles")
+    chunks = [chunk async for chunk in definition["reader"]()]
+
+    metadata, content = chunks[0]
+    listing = json.loads(content)
+    assert metadata["content_type"] == "application/json"
+    assert listing["profiles"][0]["name"] == "sample"
@@ -0,0 +1,147 @@
+"""Tests for the per-session state store."""
+
+import json
+import sys
+from collections import OrderedDict
+
+import pytest
+
+from template_mcp.sessions import SessionManager
+
+
+class FakeSession:
+    """Stand-in for a server session."""
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Initialize the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+def test_idle_sessions_are_evicted():
+    """Test that sessions idle past the timeout are evicted."""
+    clock = FakeClock()
+    manager = SessionManager(idle_timeout=10.0, clock=clock)
+    idle, busy = FakeSession(), FakeSession()
+
+    manager.get(idle)
+    manager.get(busy).active_requests = 1
+    clock.now = 11.0
+
+    assert manager.evict_idle() == 1
+    assert len(manager) == 1
+    assert manager.stats()["evicted_idle"] == 1
+
+
+def test_capacity_evicts_least_recently_used_idle_session():
+    """Test that the global cap evicts the least recently used idle session."""
+    clock = FakeClock()
+    manager = SessionManager(max_sessions=2, clock=clock)
+    first, second, third = FakeSession(), FakeSession(), FakeSession()
+
+    first_record = manager.get(first)
+    first_record.log_level = "debug"
+    manager.get(second)
+    manager.get(first)
+    manager.get(third)
+
+    assert len(manager) == 2
+    assert manager.get(first) is first_record
+    assert manager.stats()["evicted_capacity"] == 1
+
+
+def test_capacity_eviction_skips_subscribed_sessions():
+    """Test that sessions holding subscriptions survive capacity eviction."""
+    manager = SessionManager(max_sessions=2, clock=FakeClock())
+    subscribed, idle, newcomer = FakeSession(), FakeSession(), FakeSession()
+
+    manager.get(subscribed).subscribe("resource://example-resource")
+    manager.get(idle)
+    manager.get(newcomer)
+
+    records = {record.session for record in manager.records()}
+    assert records == {subscribed, newcomer}
+
+
+def test_closed_sessions_are_forgotten():
+    """Test that a record is dropped once its session is garbage collected."""
+    manager = SessionManager()
+    session = FakeSession()
+    manager.get(session)
+
+    del session
+
+    assert len(manager) == 0
+
+
+def test_session_cache_respects_memory_budget():
+    """Test that the per-session cache evicts entries beyond its budget."""
+    manager = SessionManager(session_memory_budget=4096)
+    record = manager.get(FakeSession())
+
+    assert record.cache_put("a", b"x" * 1500)
+    assert record.cache_put("b", b"x" * 1500)
+    assert record.cache_get("a") is not None
+    assert record.cache_put("c", b"x" * 1500)
+
+    assert record.cache_get("b") is None
+    assert record.cache_get("a") is not None
+    assert record.cache_bytes <= 4096
+    assert not record.cache_put("huge", b"x" * 5000)
+
+
+def test_session_memory_stays_within_budget():
+    """Test that the cache's own bookkeeping counts against the budget."""
+    budget = 64 * 1024
+    manager = SessionManager(session_memory_budget=budget)
+    record = manager.get(FakeSession())
+    fixed_cost = record.memory_usage() + sys.getsizeof(OrderedDict())
+
+    for i in range(2000):
+        record.cache_put(f"count-chars:{i:016x}", {"count": i})
+        if i % 3 == 0:
+            record.cache_pop(f"count-chars:{i - 1:016x}")
+        assert record.memory_usage() <= budget + fixed_cost
+
+    # Emptying most of the cache does not leave an oversized table behind
+    for key in list(record.cache)[:-5]:
+        record.cache_pop(key)
+    assert record.memory_usage() <= budget // 8 + fixed_cost
+
+
+def test_stats_report_bytes_per_session():
+    """Test that stats include per-session byte counts."""
+    manager = SessionManager()
+    sessions = [FakeSession() for _ in range(3)]
+    for session in sessions:
+        manager.get(session)
+    manager.get(sessions[0]).cache_put("key", "value" * 100)
+
+    stats = manager.stats()
+
+    assert stats["sessions"] == 3
+    assert stats["total_bytes"] > 0
+    assert stats["max_session_bytes"] > stats["bytes_per_session"]
+
+
+@pytest.mark.asyncio
+async def test_server_tracks_log_level_and_exposes_stats(template_server, mcp_client):
+    """Test that the server records session state and reports it."""
+    await mcp_client.set_logging_level("warning")
+    await mcp_client.subscribe_resource("resource://example-resource")
+    result = await mcp_client.read_resource("resource://session-stats")
+    records = list(template_server.sessions.records())
+
+    stats = json.loads(result.contents[0].text)
+    assert stats["sessions"] == 1
+    assert stats["bytes_per_session"] > 0
+    assert len(records) == 1
+    assert records[0].log_level == "warning"
+    assert records[0].subscriptions == {"resource://example-resource"}
@@ -0,0 +1,179 @@
+"""Tests for resource change subscriptions and delta reads."""
+
+import asyncio
+import base64
+
+import pytest
+from mcp import types
+from pydantic import AnyUrl
+
+from template_mcp.resources.reader_resource import ReaderResource
+from template_mcp.resources.subscriptions import ResourceChangeHub
+from template_mcp.sessions import SessionManager
+from template_mcp.tools.call_log import ToolCallLog
+
+URI = "resource://example-resource"
+
+
+def test_delta_returns_bytes_appended_since_version():
+    """Test that deltas cover appends and fall back once history is gone."""
+    hub = ResourceChangeHub(buffer_bytes=10)
+
+    hub.publish_append(URI, b"abc")
+    hub.publish_append(URI, b"def")
+
+    assert hub.delta(URI, 0) == b"abcdef"
+    assert hub.delta(URI, 1) == b"def"
+    assert hub.delta(URI, 2) == b""
+    assert hub.delta(URI, 5) is None
+
+    # The buffer only holds 10 bytes, so version 1 is no longer covered
+    hub.publish_append(URI, b"ghijk")
+    assert hub.delta(URI, 0) is None
+    assert hub.delta(URI, 1) == b"defghijk"
+
+    hub.publish_change(URI)
+    assert hub.delta(URI, 3) is None
+    assert hub.delta(URI, hub.version(URI)) == b""
+
+
+@pytest.mark.asyncio
+async def test_subscribers_get_one_notification_per_burst(template_server):
+    """Test that rapid changes are coalesced into a single notification."""
+    notifications = []
+
+    async def message_handler(message):
+        if isinstance(message, types.ServerNotification):
+            notifications.append(message.root)
+
+    emitter = template_server.changes.emitter("example-resource")
+    async with template_server.connect(message_handler=message_handler) as session:
+        capabilities = session.get_server_capabilities()
+        assert capabilities.resources.subscribe
+
+        await session.subscribe_resource(URI)
+        for i in range(5):
+            emitter.append(f"line {i}\n".encode())
+        await asyncio.sleep(template_server.changes.debounce + 0.1)
+
+    assert len(notifications) == 1
+    assert str(notifications[0].params.uri) == URI
+    assert template_server.changes.notifications_sent == 1
+
+
+class FakeSubscriber:
+    """Session stand-in whose notifications take ``delay`` seconds to send."""
+
+    def __init__(self, delay: float):
+        """Initialize the subscriber."""
+        self.delay = delay
+        self.notified = []
+
+    async def send_resource_updated(self, uri):
+        """Record the notification after the delay."""
+        await asyncio.sleep(self.delay)
+        self.notified.append(str(uri))
+
+
+@pytest.mark.asyncio
+async def test_flush_notifies_concurrently_with_timeout():
+    """Test that a stalled subscriber neither blocks nor delays the others."""
+    sessions = SessionManager()
+    hub = ResourceChangeHub(sessions=sessions, notify_timeout=0.1)
+    stalled = FakeSubscriber(delay=10.0)
+    fast = [FakeSubscriber(delay=0.05) for _ in range(3)]
+    for subscriber in (stalled, *fast):
+        sessions.get(subscriber).subscribe(URI)
+
+    start = asyncio.get_running_loop().time()
+    sent = await hub.flush(URI)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert sent == 3
+    assert all(subscriber.notified == [URI] for subscriber in fast)
+    assert not stalled.notified
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_tool_call_log_delta_matches_full_read(template_server, mcp_client):
+    """Test that a full read plus the delta since it equals the next full read."""
+    log_uri = "resource://tool-call-log"
+    await mcp_client.call_tool("echo", {"message": "first"})
+    full = await mcp_client.read_resource(log_uri)
+    version = full.contents[0].meta["version"]
+
+    await mcp_client.call_tool("echo", {"message": "second"})
+    await mcp_client.call_tool("count-chars", {"message": "third"})
+    delta = await mcp_client.read_resource(f"{log_uri}?since_version={version}")
+    after = await mcp_client.read_resource(log_uri)
+
+    assert delta.contents[0].meta["delta"] == "append"
+    assert delta.contents[0].meta["version"] == version + 2
+    assert after.contents[0].meta["version"] == version + 2
+    assert full.contents[0].text + delta.contents[0].text == after.contents[0].text
+    assert after.contents[0].text.splitlines()[-1].split()[1] == "count-chars"
+
+
+def test_tool_call_log_reports_a_change_once_trimmed():
+    """Test that dropping old lines is reported as a change, not an append."""
+    hub = ResourceChangeHub()
+    log = ToolCallLog(max_bytes=200)
+    log.watch(hub.emitter("tool-call-log"))
+    uri = "resource://tool-call-log"
+
+    log.record("echo", 1.0, "ok")
+    assert hub.delta(uri, 0) is not None
+    while hub.delta(uri, 0) is not None:
+        log.record("echo", 1.0, "ok")
+
+    # Only whole lines are kept
+    assert len(log._buffer) <= 200
+    lines = log._buffer.decode().split("\n")
+    assert lines.pop() == ""
+    assert all(line.split()[1:] == ["echo", "1.0ms", "ok"] for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_read_reports_version_of_the_content_read(template_server, mcp_client):
+    """Test that a change published during a read makes the read start over."""
+    reads = []
+    emitter = template_server.changes.emitter("racy")
+
+    async def racy_reader(path=None):
+        reads.append(len(reads))
+        if len(reads) == 1:
+            # A writer lands while the content is being produced
+            emitter.changed()
+        yield {"content_type": "text/plain"}, f"read {len(reads)}".encode()
+
+    template_server.server.add_resource(
+        ReaderResource(
+            uri=AnyUrl("resource://racy"),
+            name="racy",
+            mime_type="text/plain",
+            reader=racy_reader,
+        )
+    )
+
+    result = await mcp_client.read_resource("resource://racy")
+
+    assert result.contents[0].text == "read 2"
+    assert result.contents[0].meta["version"] == 1
+    assert len(reads) == 2
+
+
+@pytest.mark.asyncio
+async def test_read_resource_full_and_range(template_server, mcp_client):
+    """Test stale versions fall back to the full content and ranges slice it."""
+    full = await mcp_client.read_resource(URI)
+    version = full.contents[0].meta["version"]
+    text = full.contents[0].text
+
+    stale = await mcp_client.read_resource(f"{URI}?since_version={version + 7}")
+    assert stale.contents[0].meta["delta"] == "full"
+    assert stale.contents[0].text == text
+
+    chunk = await mcp_client.read_resource(f"{URI}?offset=8&length=7")
+    assert base64.b64decode(chunk.contents[0].blob) == text.encode()[8:15]
+    assert chunk.contents[0].meta["delta"] == "range"
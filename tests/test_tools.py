@@ -1,8 +1,12 @@
 """Tests for tools module."""
 
+import json
+
 import pytest
 
+from template_mcp.sessions import SessionManager
 from template_mcp.tools.example_tool import register_tools
+from template_mcp.tools.incremental_count import register_incremental_tools
 
 
 class MockServer:
@@ -104,3 +108,124 @@ async def test_count_chars_tool_validation_error():
     assert len(result["content"]) == 1
     assert result["content"][0]["type"] == "text"
     assert "Error: Invalid input parameters" in result["content"][0]["text"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_count_matches_full_text():
+    """Test that appended counts equal count-chars on the full text."""
+    # Set up mock server and register tools
+    mock_server = MockServer()
+    register_tools(mock_server)
+    register_incremental_tools(mock_server, SessionManager())
+
+    text = "Live TRANSCRIPT line 1\n  speaker-2: hello\tWORLD 42 Été  end"
+    for split_points in (
+        [],
+        [3],
+        [4, 5],
+        [1, 2, 3, 20, 21, 30],
+        list(range(1, len(text))),
+    ):
+        bounds = [0] + split_points + [len(text)]
+        parts = [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+        result = await mock_server.tools["count-chars-open"](parts[0])
+        handle = result["content"][1]["json"]["handle"]
+        for part in parts[1:]:
+            result = await mock_server.tools["count-chars-append"](handle, part)
+
+        expected = await mock_server.tools["count-chars"](text)
+        expected_counts = dict(expected["content"][1]["json"])
+        del expected_counts["message"]
+        counts = dict(result["content"][1]["json"])
+        del counts["handle"]
+        assert counts == expected_counts
+
+
+@pytest.mark.asyncio
+async def test_incremental_count_close_and_unknown_handle():
+    """Test closing a handle and using an unknown handle."""
+    # Set up mock server and register tools
+    mock_server = MockServer()
+    register_incremental_tools(mock_server, SessionManager())
+
+    result = await mock_server.tools["count-chars-open"]("split wo")
+    handle = result["content"][1]["json"]["handle"]
+    await mock_server.tools["count-chars-append"](handle, "rd here")
+
+    result = await mock_server.tools["count-chars-close"](handle)
+    assert result["content"][1]["json"]["word_count"] == 3
+
+    # The closed handle can no longer be used
+    result = await mock_server.tools["count-chars-append"](handle, "more")
+    assert result["isError"] is True
+    assert "Unknown or expired handle" in result["content"][0]["text"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_count_handle_expires():
+    """Test that unused handles expire after the handle TTL."""
+    # Set up mock server and register tools with a manual clock
+    mock_server = MockServer()
+    now = [1000.0]
+    register_incremental_tools(
+        mock_server, SessionManager(), handle_ttl=10.0, clock=lambda: now[0]
+    )
+
+    result = await mock_server.tools["count-chars-open"]("text")
+    handle = result["content"][1]["json"]["handle"]
+
+    now[0] += 11.0
+    result = await mock_server.tools["count-chars-append"](handle, "more")
+    assert result["isError"] is True
+
+
+@pytest.mark.asyncio
+async def test_incremental_count_rejects_opens_beyond_budget():
+    """Test that a full budget rejects new handles instead of evicting old ones."""
+    mock_server = MockServer()
+    now = [1000.0]
+    register_incremental_tools(
+        mock_server,
+        SessionManager(session_memory_budget=4096),
+        handle_ttl=10.0,
+        clock=lambda: now[0],
+    )
+
+    handles = []
+    while True:
+        result = await mock_server.tools["count-chars-open"]("text")
+        if result.get("isError"):
+            break
+        handles.append(result["content"][1]["json"]["handle"])
+
+    assert handles
+    assert "Session memory budget exhausted" in result["content"][0]["text"]
+    for handle in handles:
+        result = await mock_server.tools["count-chars-append"](handle, " more")
+        assert not result.get("isError")
+
+    # Expired handles are closed to make room
+    now[0] += 11.0
+    result = await mock_server.tools["count-chars-open"]("text")
+    assert not result.get("isError")
+
+
+@pytest.mark.asyncio
+async def test_tools_through_memory_transport(mcp_client):
+    """Test calling the registered tools through a real client session."""
+    tools = await mcp_client.list_tools()
+    assert {"echo", "count-chars", "count-chars-open"} <= {t.name for t in tools.tools}
+
+    result = await mcp_client.call_tool("count-chars", {"message": "Hello, world!"})
+    analysis = json.loads(result.content[0].text)
+    assert analysis["content"][1]["json"]["character_count"] == 13
+
+    # Handles are scoped to the client session
+    result = await mcp_client.call_tool("count-chars-open", {"message": "Hel"})
+    handle = json.loads(result.content[0].text)["content"][1]["json"]["handle"]
+    result = await mcp_client.call_tool(
+        "count-chars-append", {"handle": handle, "delta": "lo world"}
+    )
+    counts = json.loads(result.content[0].text)["content"][1]["json"]
+    assert counts["word_count"] == 2